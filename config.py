@@ -1,3 +1,5 @@
+from types import MappingProxyType
+
 # API Base URLs
 NWS_API_BASE = "https://api.weather.gov"
 OPEN_METEO_API_BASE = "https://api.open-meteo.com/v1"
@@ -9,16 +11,26 @@ USER_AGENT = "mcp-cloud-server/1.0 (https://github.com/datavtar/mcp-cloud-server
 
 # Request Settings
 DEFAULT_TIMEOUT = 30.0
+CONNECT_TIMEOUT = 5.0  # Fail fast on unreachable hosts; reads keep DEFAULT_TIMEOUT
 
 # LLM Provider Settings
 # Default provider for the intelligent service
 # Options: "anthropic", "openai", "gemini", "vertex"
 LLM_PROVIDER = "anthropic"
 
+# Exact-match LLM response cache (seconds; 0 disables). Off by default: the
+# agents already cache final results, and later turns carry tool output in
+# the key, so they almost never hit
+LLM_CACHE_TTL = 0
+LLM_CACHE_MAX_ENTRIES = 256
+
+# Cumulative tokens a ServiceAgent request may spend before it is told to wrap up
+AGENT_TOKEN_BUDGET = 50_000
+
 # Note: Model defaults are configured in .env (e.g., ANTHROPIC_MODEL, OPENAI_MODEL)
 
 # Unified model configuration (provider + pricing)
-MODELS = {
+_MODELS = {
     # Anthropic
     "claude-haiku-4-5": {"provider": "anthropic", "pricing": {"input": 1.00, "output": 5.00}},
     "claude-sonnet-4": {"provider": "anthropic", "pricing": {"input": 3.00, "output": 15.00}},
@@ -32,5 +44,18 @@ MODELS = {
     "gemini-3-flash-preview": {"provider": "gemini", "pricing": {"input": 0.50, "output": 3.00}},
 }
 
+# Frozen so the same mappings can be shared everywhere without defensive copies
+MODELS = MappingProxyType({
+    name: MappingProxyType({
+        "provider": spec["provider"],
+        "pricing": MappingProxyType(spec["pricing"]),
+    })
+    for name, spec in _MODELS.items()
+})
+
 # Default pricing if model not found
-DEFAULT_PRICING = {"input": 1.00, "output": 5.00}
+DEFAULT_PRICING = MappingProxyType({"input": 1.00, "output": 5.00})
+
+# Flat per-model views of MODELS for single-lookup access
+MODEL_PRICING = MappingProxyType({name: spec["pricing"] for name, spec in MODELS.items()})
+MODEL_PROVIDER = MappingProxyType({name: spec["provider"] for name, spec in MODELS.items()})
@@ -1,9 +1,17 @@
 #!/usr/bin/env python3
 """Deploy MCP Cloud Server to Google Cloud Run."""
 
+import fnmatch
+import hashlib
+import os
 import subprocess
 import sys
 import argparse
+from pathlib import Path
+
+
+SOURCE_ROOT = Path(__file__).resolve().parent
+DIGEST_TAG_LENGTH = 12
 
 
 def run_command(command: list[str], description: str) -> bool:
@@ -13,7 +21,19 @@ def run_command(command: list[str], description: str) -> bool:
     print(f"{'='*60}")
     print(f"Running: {' '.join(command)}\n")
 
-    result = subprocess.run(command)
+    # Flush our banner first so it isn't reordered after the child's output
+    sys.stdout.flush()
+
+    # Python still needs the exit status (and later the service URL), so the
+    # child is spawned rather than exec'd; no shell and no inherited fds.
+    # It inherits our stdout/stderr, so gcloud writes straight to them,
+    # unbuffered, and progress shows up as it happens.
+    result = subprocess.run(
+        command,
+        shell=False,
+        close_fds=True,
+        env={**os.environ, "PYTHONUNBUFFERED": "1"},
+    )
 
     if result.returncode != 0:
         print(f"\nError: {description} failed with exit code {result.returncode}")
@@ -23,6 +43,75 @@ def run_command(command: list[str], description: str) -> bool:
     return True
 
 
+def capture_command(command: list[str]) -> subprocess.CompletedProcess:
+    """Run a command and capture its output as text."""
+    return subprocess.run(command, capture_output=True, text=True, shell=False, close_fds=True)
+
+
+def _load_ignore_patterns(root: Path) -> list[str]:
+    """Read ignore patterns from .gcloudignore, falling back to .gitignore.
+
+    Negated (``!``) patterns and ``#!include`` directives are not supported.
+    """
+    for name in (".gcloudignore", ".gitignore"):
+        ignore_file = root / name
+        if ignore_file.is_file():
+            patterns = [".git/", name]
+            for line in ignore_file.read_text().splitlines():
+                line = line.strip()
+                if line and not line.startswith(("#", "!")):
+                    patterns.append(line)
+            return patterns
+    return [".git/"]
+
+
+def _is_ignored(rel_path: str, patterns: list[str]) -> bool:
+    """Check a POSIX relative path against gitignore-style patterns."""
+    parts = rel_path.split("/")
+    for pattern in patterns:
+        anchored = pattern.startswith("/")
+        directory_only = pattern.endswith("/")
+        pattern = pattern.strip("/")
+
+        if anchored or "/" in pattern:
+            candidates = ["/".join(parts[:i]) for i in range(1, len(parts) + 1)]
+        else:
+            candidates = parts
+
+        # Directory patterns must not match the final (file) component
+        if directory_only:
+            candidates = candidates[:-1]
+
+        if any(fnmatch.fnmatch(candidate, pattern) for candidate in candidates):
+            return True
+    return False
+
+
+def compute_source_digest(root: Path = SOURCE_ROOT) -> str:
+    """Compute a SHA256 digest over the build context, honoring ignore files."""
+    patterns = _load_ignore_patterns(root)
+    digest = hashlib.sha256()
+
+    for path in sorted(p for p in root.rglob("*") if p.is_file()):
+        rel_path = path.relative_to(root).as_posix()
+        if _is_ignored(rel_path, patterns):
+            continue
+        digest.update(rel_path.encode())
+        digest.update(b"\0")
+        digest.update(hashlib.sha256(path.read_bytes()).digest())
+
+    return digest.hexdigest()
+
+
+def image_exists(image: str, project_id: str) -> bool:
+    """Check whether a tagged image already exists in the registry."""
+    command = [
+        "gcloud", "container", "images", "describe", image,
+        "--project", project_id,
+    ]
+    return capture_command(command).returncode == 0
+
+
 def deploy(
     project_id: str,
     region: str = "us-central1",
@@ -44,15 +133,33 @@ def deploy(
     """
     image_url = f"gcr.io/{project_id}/{service_name}"
 
-    # Step 1: Build and push container image
+    # Step 1: Build and push container image, tagged by source digest so an
+    # unchanged tree reuses the image that is already in the registry
     if not skip_build:
-        build_command = [
-            "gcloud", "builds", "submit",
-            "--tag", image_url,
+        digest = compute_source_digest()
+        image_url = f"{image_url}:{digest[:DIGEST_TAG_LENGTH]}"
+
+        if image_exists(image_url, project_id):
+            print(f"\nImage {image_url} already exists for this source, skipping build.")
+        else:
+            build_command = [
+                "gcloud", "builds", "submit",
+                "--tag", image_url,
+                "--project", project_id,
+            ]
+
+            if not run_command(build_command, "Building container image"):
+                return False
+
+        # Keep :latest pointing at this build so --skip-build deploys it
+        tag_command = [
+            "gcloud", "container", "images", "add-tag",
+            image_url, f"gcr.io/{project_id}/{service_name}:latest",
             "--project", project_id,
+            "--quiet",
         ]
 
-        if not run_command(build_command, "Building container image"):
+        if not run_command(tag_command, "Tagging image as latest"):
             return False
 
     # Step 2: Deploy to Cloud Run
@@ -83,7 +190,7 @@ def deploy(
     print(">>> Getting service URL")
     print(f"{'='*60}")
 
-    result = subprocess.run(url_command, capture_output=True, text=True)
+    result = capture_command(url_command)
 
     if result.returncode == 0 and result.stdout.strip():
         service_url = result.stdout.strip()
@@ -102,7 +209,8 @@ def deploy(
     return True
 
 
-def main():
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser for the deploy script."""
     parser = argparse.ArgumentParser(
         description="Deploy MCP Cloud Server to Google Cloud Run",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -145,7 +253,15 @@ Examples:
         help="Skip building container, deploy existing image",
     )
 
-    args = parser.parse_args()
+    return parser
+
+
+_PARSER = _build_parser()
+
+
+def main(argv: list[str] | None = None):
+    """CLI entry point; parses ``argv`` (defaults to ``sys.argv[1:]``)."""
+    args = _PARSER.parse_args(argv)
 
     success = deploy(
         project_id=args.project_id,
@@ -1,17 +1,6 @@
 """MCP Prompts for weather-related tasks."""
 
-
-def register_prompts(mcp):
-    """Register all prompts with the MCP server."""
-
-    @mcp.prompt()
-    def travel_weather(origin: str, destination: str) -> str:
-        """Generate a travel weather briefing prompt.
-        Args:
-            origin: Starting location (city name or coordinates)
-            destination: Destination location (city name or coordinates)
-        """
-        return f"""Please provide a comprehensive travel weather briefing for a trip from {origin} to {destination}.
+_TRAVEL_WEATHER_TEMPLATE = """Please provide a comprehensive travel weather briefing for a trip from {origin} to {destination}.
 
 Include the following information:
 1. Current weather conditions at both locations
@@ -23,13 +12,7 @@ Include the following information:
 Use the available weather tools to gather accurate, real-time data for this analysis.
 """
 
-    @mcp.prompt()
-    def severe_weather_summary(state: str) -> str:
-        """Generate a severe weather analysis prompt for a US state.
-        Args:
-            state: Two-letter US state code (e.g., CA, NY)
-        """
-        return f"""Please provide a comprehensive severe weather analysis for {state.upper()}.
+_SEVERE_WEATHER_TEMPLATE = """Please provide a comprehensive severe weather analysis for {state}.
 
 Include the following:
 1. Current active weather alerts and warnings
@@ -41,14 +24,7 @@ Include the following:
 Use the available NWS tools to get accurate, official weather alert data.
 """
 
-    @mcp.prompt()
-    def clothing_recommendation(latitude: float, longitude: float) -> str:
-        """Generate clothing recommendations based on weather.
-        Args:
-            latitude: Latitude of the location
-            longitude: Longitude of the location
-        """
-        return f"""Based on the current weather conditions and forecast for location ({latitude}, {longitude}), please provide clothing recommendations.
+_CLOTHING_TEMPLATE = """Based on the current weather conditions and forecast for location ({latitude}, {longitude}), please provide clothing recommendations.
 
 Consider the following factors:
 1. Current temperature and "feels like" temperature
@@ -66,15 +42,7 @@ Please provide:
 Use the weather tools to get current conditions and forecast data.
 """
 
-    @mcp.prompt()
-    def outdoor_activity(latitude: float, longitude: float, activity: str) -> str:
-        """Determine if weather is suitable for an outdoor activity.
-        Args:
-            latitude: Latitude of the location
-            longitude: Longitude of the location
-            activity: The outdoor activity being planned (e.g., hiking, beach, cycling)
-        """
-        return f"""Please analyze whether the weather is suitable for {activity} at location ({latitude}, {longitude}).
+_OUTDOOR_ACTIVITY_TEMPLATE = """Please analyze whether the weather is suitable for {activity} at location ({latitude}, {longitude}).
 
 Evaluate the following:
 1. Current weather conditions
@@ -93,3 +61,43 @@ Provide:
 
 Use the available weather and air quality tools for accurate data.
 """
+
+
+def register_prompts(mcp):
+    """Register all prompts with the MCP server."""
+
+    @mcp.prompt()
+    def travel_weather(origin: str, destination: str) -> str:
+        """Generate a travel weather briefing prompt.
+        Args:
+            origin: Starting location (city name or coordinates)
+            destination: Destination location (city name or coordinates)
+        """
+        return _TRAVEL_WEATHER_TEMPLATE.format(origin=origin, destination=destination)
+
+    @mcp.prompt()
+    def severe_weather_summary(state: str) -> str:
+        """Generate a severe weather analysis prompt for a US state.
+        Args:
+            state: Two-letter US state code (e.g., CA, NY)
+        """
+        return _SEVERE_WEATHER_TEMPLATE.format(state=state.upper())
+
+    @mcp.prompt()
+    def clothing_recommendation(latitude: float, longitude: float) -> str:
+        """Generate clothing recommendations based on weather.
+        Args:
+            latitude: Latitude of the location
+            longitude: Longitude of the location
+        """
+        return _CLOTHING_TEMPLATE.format(latitude=latitude, longitude=longitude)
+
+    @mcp.prompt()
+    def outdoor_activity(latitude: float, longitude: float, activity: str) -> str:
+        """Determine if weather is suitable for an outdoor activity.
+        Args:
+            latitude: Latitude of the location
+            longitude: Longitude of the location
+            activity: The outdoor activity being planned (e.g., hiking, beach, cycling)
+        """
+        return _OUTDOOR_ACTIVITY_TEMPLATE.format(latitude=latitude, longitude=longitude, activity=activity)
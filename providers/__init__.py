@@ -1,17 +1,43 @@
-from .base import LLMProvider
-from .anthropic_provider import AnthropicProvider
-from .gemini_provider import GeminiProvider
-from .vertex_provider import VertexProvider
-from .openai_provider import OpenAIProvider
-from .openai_responses_provider import OpenAIResponsesProvider
-from .factory import get_provider
+from .base import LLMProvider, ProcessedResponse, ToolCall
+from ._http import close_http_clients
+from .batch import BatchProcessor
+from .factory import clear_provider_cache, get_provider
+
+# Concrete providers are imported on first access (PEP 562) so only the SDK
+# for the provider actually in use is loaded.
+_LAZY_PROVIDERS = {
+    "AnthropicProvider": ".anthropic_provider",
+    "GeminiProvider": ".gemini_provider",
+    "VertexProvider": ".vertex_provider",
+    "OpenAIProvider": ".openai_provider",
+    "OpenAIResponsesProvider": ".openai_responses_provider",
+}
 
 __all__ = [
     "LLMProvider",
+    "ProcessedResponse",
+    "ToolCall",
+    "BatchProcessor",
     "AnthropicProvider",
     "GeminiProvider",
     "VertexProvider",
     "OpenAIProvider",
     "OpenAIResponsesProvider",
     "get_provider",
+    "clear_provider_cache",
+    "close_http_clients",
 ]
+
+
+def __getattr__(name: str):
+    if name in _LAZY_PROVIDERS:
+        from importlib import import_module
+
+        value = getattr(import_module(_LAZY_PROVIDERS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
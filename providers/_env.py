@@ -0,0 +1,35 @@
+"""Provider settings read from the environment once at import.
+
+Providers and the factory read these module attributes instead of calling
+``os.environ.get`` on every instantiation. Unset values are None; each
+provider applies its own default. Call ``reload_env()`` after changing the
+environment at runtime (e.g. in tests), followed by
+``clear_provider_cache()`` to drop instances built from old values.
+"""
+import os
+
+OPENAI_API_MODE: str = "completions"
+OPENAI_MODEL: str | None = None
+ANTHROPIC_MODEL: str | None = None
+GEMINI_MODEL: str | None = None
+VERTEX_MODEL: str | None = None
+GOOGLE_API_KEY: str | None = None
+GOOGLE_CLOUD_API_KEY: str | None = None
+
+
+def reload_env() -> None:
+    """Re-read provider settings from ``os.environ``."""
+    global OPENAI_API_MODE, OPENAI_MODEL, ANTHROPIC_MODEL, GEMINI_MODEL
+    global VERTEX_MODEL, GOOGLE_API_KEY, GOOGLE_CLOUD_API_KEY
+
+    environ = os.environ
+    OPENAI_API_MODE = environ.get("OPENAI_API_MODE", "completions")
+    OPENAI_MODEL = environ.get("OPENAI_MODEL")
+    ANTHROPIC_MODEL = environ.get("ANTHROPIC_MODEL")
+    GEMINI_MODEL = environ.get("GEMINI_MODEL")
+    VERTEX_MODEL = environ.get("VERTEX_MODEL")
+    GOOGLE_API_KEY = environ.get("GOOGLE_API_KEY")
+    GOOGLE_CLOUD_API_KEY = environ.get("GOOGLE_CLOUD_API_KEY")
+
+
+reload_env()
@@ -0,0 +1,54 @@
+"""Shared HTTP transport for provider SDK clients."""
+from importlib.util import find_spec
+
+import httpx
+
+# httpx only speaks HTTP/2 when the optional h2 package is installed
+HTTP2_AVAILABLE = find_spec("h2") is not None
+
+HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+HTTP_TIMEOUT = 60.0
+
+_openai_http_client = None
+_anthropic_http_client = None
+
+
+def get_openai_http_client():
+    """Return the process-wide HTTP client shared by all OpenAI providers.
+
+    Reusing one keep-alive (HTTP/2 when available) connection pool across
+    provider instances avoids a TLS handshake per client.
+    """
+    global _openai_http_client
+    if _openai_http_client is None:
+        from openai import DefaultAsyncHttpxClient
+
+        _openai_http_client = DefaultAsyncHttpxClient(
+            http2=HTTP2_AVAILABLE,
+            limits=HTTP_LIMITS,
+            timeout=HTTP_TIMEOUT,
+        )
+    return _openai_http_client
+
+
+def get_anthropic_http_client():
+    """Return the process-wide HTTP client shared by all Anthropic providers."""
+    global _anthropic_http_client
+    if _anthropic_http_client is None:
+        from anthropic import DefaultAsyncHttpxClient
+
+        _anthropic_http_client = DefaultAsyncHttpxClient(
+            http2=HTTP2_AVAILABLE,
+            limits=HTTP_LIMITS,
+            timeout=HTTP_TIMEOUT,
+        )
+    return _anthropic_http_client
+
+
+async def close_http_clients() -> None:
+    """Close the shared provider HTTP clients (call on app shutdown)."""
+    global _openai_http_client, _anthropic_http_client
+    for client in (_openai_http_client, _anthropic_http_client):
+        if client is not None:
+            await client.aclose()
+    _openai_http_client = _anthropic_http_client = None
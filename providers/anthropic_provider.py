@@ -1,54 +1,135 @@
 """Anthropic Claude LLM provider implementation."""
-import os
+import sys
 import anthropic
 from typing import Any
 
-from .base import LLMProvider
+from .base import LLMProvider, tools_cache_key
+from . import _env
+from ._http import get_anthropic_http_client
 
 
 # Default configuration
 ANTHROPIC_MAX_TOKENS = 4096
 DEFAULT_ANTHROPIC_MODEL = "claude-haiku-4-5"
 
+# Interned message keys/values reused by every tool-loop iteration
+_TYPE = sys.intern("type")
+_ROLE = sys.intern("role")
+_CONTENT = sys.intern("content")
+_TOOL_USE_ID = sys.intern("tool_use_id")
+_TOOL_RESULT = sys.intern("tool_result")
+_ASSISTANT = sys.intern("assistant")
+
+# Prompt cache breakpoint; prefixes below the model's minimum length are just not cached
+_CACHE_CONTROL = {"type": "ephemeral"}
+
 
 class AnthropicProvider(LLMProvider):
     """LLM provider for Anthropic Claude models."""
 
+    __slots__ = ("client", "_system_cache")
+
     def __init__(self, model_type: str | None = None, model: str | None = None):
         super().__init__(model_type, model)
-        self.client = anthropic.Anthropic()
-        self._model = model or os.environ.get("ANTHROPIC_MODEL", DEFAULT_ANTHROPIC_MODEL)
-
-    @property
-    def model_name(self) -> str:
-        """Return the model name being used."""
-        return self._model
+        self.client = anthropic.AsyncAnthropic(http_client=get_anthropic_http_client())
+        self.model_name = model or _env.ANTHROPIC_MODEL or DEFAULT_ANTHROPIC_MODEL
+        self._system_cache = None  # (system_prompt, system blocks)
 
     async def complete_with_tools(
         self,
         messages: list[dict],
         tools: list[dict],
-        system_prompt: str
+        system_prompt: str,
+        json_mode: bool = False,
     ) -> Any:
-        """Send messages to Claude with tool definitions."""
-        return self.client.messages.create(
-            model=self._model,
+        """Send messages to Claude with tool definitions.
+
+        The static tools + system prefix and the conversation so far are
+        marked as prompt cache breakpoints, so later iterations of the loop
+        are billed and served from the cache.
+        """
+        return await self.client.messages.create(
+            model=self.model_name,
             max_tokens=ANTHROPIC_MAX_TOKENS,
-            system=system_prompt,
-            tools=tools,
-            messages=messages
+            system=self._cached_system(system_prompt),
+            tools=self._cached_tools(tools),
+            messages=self._with_history_breakpoint(messages)
         )
 
+    def _cached_system(self, system_prompt: str) -> list[dict] | str:
+        """Return the system prompt as a single cache-marked text block."""
+        if not system_prompt:
+            return system_prompt
+        if self._system_cache is not None and self._system_cache[0] == system_prompt:
+            return self._system_cache[1]
+        blocks = [{"type": "text", "text": system_prompt, "cache_control": _CACHE_CONTROL}]
+        self._system_cache = (system_prompt, blocks)
+        return blocks
+
+    def _cached_tools(self, tools: list[dict]) -> list[dict]:
+        """Return tools with a cache breakpoint on the last definition."""
+        if not tools:
+            return tools
+        key = tools_cache_key(tools)
+        if self._tools_cache is not None and self._tools_cache[0] == key:
+            return self._tools_cache[1]
+        marked = tools[:-1] + [{**tools[-1], "cache_control": _CACHE_CONTROL}]
+        self._tools_cache = (key, marked)
+        return marked
+
+    @staticmethod
+    def _with_history_breakpoint(messages: list[dict]) -> list[dict]:
+        """Mark the newest message so the growing history is cached incrementally.
+
+        The caller's messages are not modified; only the last message (and
+        its last content block) is copied.
+        """
+        if not messages:
+            return messages
+        last = messages[-1]
+        content = last.get(_CONTENT)
+        if isinstance(content, str):
+            if not content:
+                return messages
+            blocks = [{_TYPE: "text", "text": content, "cache_control": _CACHE_CONTROL}]
+        elif isinstance(content, list) and content and isinstance(content[-1], dict):
+            blocks = content[:-1] + [{**content[-1], "cache_control": _CACHE_CONTROL}]
+        else:
+            return messages  # SDK content blocks from the assistant; leave untouched
+        return messages[:-1] + [{**last, _CONTENT: blocks}]
+
+    def _partition(self, response: Any) -> tuple[list[Any], list[Any]]:
+        """Split response content into (tool_use blocks, other blocks) in one pass.
+
+        The result is stashed on the response object so repeated calls for the
+        same response don't walk the content again.
+        """
+        parsed = response.__dict__.get("_parsed")
+        if parsed is not None:
+            return parsed
+
+        tool_uses = []
+        other_blocks = []
+        for block in response.content:
+            if block.type == "tool_use":
+                tool_uses.append(block)
+            else:
+                other_blocks.append(block)
+
+        parsed = (tool_uses, other_blocks)
+        response.__dict__["_parsed"] = parsed
+        return parsed
+
     def parse_tool_calls(self, response: Any) -> list[Any]:
         """Extract tool_use blocks from Claude's response."""
-        return [block for block in response.content if block.type == "tool_use"]
+        return self._partition(response)[0]
 
     def format_tool_result(self, tool_use_id: str, tool_name: str, result: str) -> dict:
         """Format tool result for Claude's expected format."""
         return {
-            "type": "tool_result",
-            "tool_use_id": tool_use_id,
-            "content": result
+            _TYPE: _TOOL_RESULT,
+            _TOOL_USE_ID: tool_use_id,
+            _CONTENT: result
         }
 
     def is_complete(self, response: Any) -> bool:
@@ -57,14 +138,15 @@ class AnthropicProvider(LLMProvider):
 
     def extract_final_response(self, response: Any) -> str:
         """Extract text content from Claude's response."""
-        for block in response.content:
-            if hasattr(block, "text"):
-                return block.text
+        for block in self._partition(response)[1]:
+            text = getattr(block, "text", None)
+            if text is not None:
+                return text
         return ""
 
     def format_assistant_message(self, response: Any) -> dict:
         """Format Claude's response as an assistant message."""
-        return {"role": "assistant", "content": response.content}
+        return {_ROLE: _ASSISTANT, _CONTENT: response.content}
 
     def get_usage(self, response: Any) -> dict:
         """Extract token usage from Claude's response."""
@@ -1,8 +1,75 @@
 """Abstract base class for LLM providers."""
+import json
 from abc import ABC, abstractmethod
-from typing import Any
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Mapping
 
-from config import MODELS, DEFAULT_PRICING
+from config import MODEL_PRICING, DEFAULT_PRICING
+
+
+# Number of in-flight conversations whose converted messages are remembered
+CONVERSION_CACHE_SIZE = 32
+
+# Canonical JSON -> shared schema dict; see intern_schema
+_SCHEMA_INTERN: dict[str, dict] = {}
+
+
+@dataclass(slots=True, frozen=True)
+class ToolCall:
+    """Represents a tool call parsed from a provider response.
+
+    ``input`` may alias the provider response's own args mapping; treat it
+    as read-only.
+    """
+    id: str
+    name: str
+    input: dict
+
+
+@dataclass(slots=True)
+class ProcessedResponse:
+    """Everything the agentic loop needs from one provider response.
+
+    ``assistant_message`` is only built when the response requests tool
+    calls; it is None otherwise.
+    """
+    is_complete: bool
+    tool_calls: list[ToolCall]
+    assistant_message: dict | None
+    final_text: str
+    usage: dict
+
+
+def tools_cache_key(tools: list[dict]) -> tuple:
+    """Cheap fingerprint of a tool list for caching converted tool schemas.
+
+    Combines the list identity with its length and first/last tool names so a
+    mutated or recycled list doesn't hit a stale cache entry.
+    """
+    return (id(tools), len(tools), tools[0]["name"], tools[-1]["name"])
+
+
+def intern_schema(schema: dict) -> dict:
+    """Return a shared dict for schemas that are equal after key sorting.
+
+    Tool lists re-sent by clients (e.g. on reconnect) carry fresh but
+    identical schema dicts; interning them keeps one copy per unique schema
+    in converted tool lists. The returned dict must not be mutated.
+    """
+    key = json.dumps(schema, sort_keys=True, separators=(",", ":"))
+    return _SCHEMA_INTERN.setdefault(key, schema)
+
+
+def args_to_dict(args: Any) -> dict:
+    """Return function-call args as a dict, without copying when already a dict.
+
+    Shared by the google-genai backed providers, whose function-call args may
+    arrive as a dict or as a proto map.
+    """
+    if not args:
+        return {}
+    return args if isinstance(args, dict) else dict(args)
 
 
 class LLMProvider(ABC):
@@ -10,8 +77,16 @@ class LLMProvider(ABC):
 
     Implement this class to add support for new LLM providers
     (OpenAI, Gemini, etc.).
+
+    Attributes:
+        model_name: The model name being used. Subclasses must set this
+                    in ``__init__``.
     """
 
+    __slots__ = ("_model_type", "_requested_model", "_pricing", "_tools_cache", "_convert_cache", "model_name")
+
+    model_name: str
+
     def __init__(self, model_type: str | None = None, model: str | None = None):
         """Initialize provider with optional model type and model override.
 
@@ -23,28 +98,83 @@ class LLMProvider(ABC):
         """
         self._model_type = model_type
         self._requested_model = model
+        self._pricing = None
+        self._tools_cache = None  # (tools_cache_key, converted tools)
+        self._convert_cache = OrderedDict()
 
-    @property
-    @abstractmethod
-    def model_name(self) -> str:
-        """Return the model name being used."""
-        pass
+    def _extend_converted(
+        self,
+        messages: list[dict],
+        convert: Callable[[list[dict], list], None],
+        initial: list | None = None,
+        key: Any = None,
+    ) -> list:
+        """Convert messages incrementally, reusing the prefix from the last call.
+
+        The agentic loop only appends to ``messages``, so the provider-format
+        items built on the previous iteration are reused and only the new
+        messages are passed to ``convert``, which appends its output to the
+        list it is given. Callers must not replace, reorder or mutate
+        messages already sent; the cached prefix is reused only when every
+        one of its items is still present, by identity, at the same position.
+
+        Args:
+            messages: Conversation history (append-only during a loop)
+            convert: Callable converting a slice of messages into the given list
+            initial: Items to start a fresh conversion with (e.g. system prompt)
+            key: Extra cache key component for inputs that shape ``initial``
+
+        Returns:
+            Converted list; a fresh list object on every call, so callers
+            never see items appended by later iterations
+        """
+        cache = self._convert_cache
+        cache_key = (id(messages), key)
+        entry = cache.get(cache_key)
+
+        start = 0
+        converted = list(initial) if initial else []
+        if entry is not None:
+            prefix, previous = entry
+            # Lists can't be weakly referenced, so the entry keeps a snapshot
+            # of the messages rather than the list; a recycled id or a
+            # rewritten history fails the identity check below.
+            count = len(prefix)
+            if count <= len(messages) and all(a is b for a, b in zip(prefix, messages)):
+                start = count
+                converted = previous.copy()
+
+        convert(messages[start:], converted)
+
+        cache[cache_key] = (tuple(messages), converted)
+        cache.move_to_end(cache_key)
+        if len(cache) > CONVERSION_CACHE_SIZE:
+            cache.popitem(last=False)
+
+        return converted
 
     @property
-    def pricing(self) -> dict:
+    def pricing(self) -> Mapping[str, float]:
         """Return pricing per million tokens from centralized config.
 
+        Resolved once per provider instance and cached thereafter.
+
         Returns:
-            Dict with 'input' and 'output' keys containing USD cost per million tokens
+            Read-only mapping with 'input' and 'output' keys containing USD cost
+            per million tokens
         """
-        return MODELS.get(self.model_name, {}).get("pricing", DEFAULT_PRICING)
+        pricing = self._pricing
+        if pricing is None:
+            pricing = self._pricing = MODEL_PRICING.get(self.model_name, DEFAULT_PRICING)
+        return pricing
 
     @abstractmethod
     async def complete_with_tools(
         self,
         messages: list[dict],
         tools: list[dict],
-        system_prompt: str
+        system_prompt: str,
+        json_mode: bool = False,
     ) -> Any:
         """Send messages to LLM with tool definitions.
 
@@ -52,12 +182,62 @@ class LLMProvider(ABC):
             messages: Conversation history
             tools: Tool definitions in provider-specific format
             system_prompt: System instructions for the LLM
+            json_mode: Hint that the final answer must be a JSON object.
+                      Providers with a JSON output mode enable it; callers
+                      must mention JSON in the prompt (OpenAI rejects the
+                      request otherwise). Others ignore the hint.
 
         Returns:
             Provider-specific response object
         """
         pass
 
+    async def complete_batch(
+        self,
+        messages_batch: list[list[dict]],
+        tools: list[dict],
+        system_prompt: str,
+        max_concurrency: int | None = None,
+        json_mode: bool = False,
+    ) -> list[Any]:
+        """Send several independent conversations concurrently.
+
+        Args:
+            messages_batch: One conversation history per request
+            tools: Tool definitions shared by every request
+            system_prompt: System instructions shared by every request
+            max_concurrency: Optional cap on calls in flight at once
+            json_mode: Passed to complete_with_tools for every request
+
+        Returns:
+            List of provider-specific response objects, in input order
+        """
+        from .batch import BatchProcessor, DEFAULT_MAX_CONCURRENCY
+
+        processor = BatchProcessor(self, max_concurrency or DEFAULT_MAX_CONCURRENCY)
+        return await processor.run(messages_batch, tools, system_prompt, json_mode=json_mode)
+
+    def process_response(self, response: Any) -> ProcessedResponse:
+        """Extract completion state, tool calls, text and usage in one call.
+
+        The default implementation combines the granular methods below;
+        providers override it when a single walk over the response is cheaper.
+
+        Args:
+            response: Provider-specific response object
+
+        Returns:
+            ProcessedResponse for the response
+        """
+        tool_calls = self.parse_tool_calls(response)
+        return ProcessedResponse(
+            is_complete=self.is_complete(response),
+            tool_calls=tool_calls,
+            assistant_message=self.format_assistant_message(response) if tool_calls else None,
+            final_text=self.extract_final_response(response),
+            usage=self.get_usage(response),
+        )
+
     @abstractmethod
     def parse_tool_calls(self, response: Any) -> list[Any]:
         """Extract tool calls from provider-specific response.
@@ -0,0 +1,82 @@
+"""Concurrent batch execution of independent LLM requests."""
+import asyncio
+import time
+from typing import Any
+
+from .base import LLMProvider
+
+
+# Default number of provider calls allowed in flight at once
+DEFAULT_MAX_CONCURRENCY = 8
+
+
+class BatchProcessor:
+    """Run many independent prompts against one provider concurrently.
+
+    Calls share the provider's client (and its connection pool), are bounded
+    by a semaphore, and can optionally be paced to a requests-per-minute
+    budget so a batch doesn't trip provider rate limits.
+    """
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        rate_limit: float | None = None,
+    ):
+        """Initialize the batch processor.
+
+        Args:
+            provider: Provider used for every call in the batch
+            max_concurrency: Maximum number of calls in flight at once
+            rate_limit: Optional maximum requests per minute
+        """
+        self.provider = provider
+        self.max_concurrency = max_concurrency
+        self._interval = 60.0 / rate_limit if rate_limit else 0.0
+        self._next_start = 0.0
+        self._pace_lock = asyncio.Lock()
+
+    async def _pace(self) -> None:
+        """Wait until the next call is allowed under the rate limit."""
+        if not self._interval:
+            return
+        async with self._pace_lock:
+            now = time.monotonic()
+            wait = self._next_start - now
+            if wait > 0:
+                await asyncio.sleep(wait)
+                now += wait
+            self._next_start = now + self._interval
+
+    async def run(
+        self,
+        messages_batch: list[list[dict]],
+        tools: list[dict],
+        system_prompt: str,
+        json_mode: bool = False,
+    ) -> list[Any]:
+        """Send each conversation in the batch and return responses in input order.
+
+        Args:
+            messages_batch: One conversation history per request
+            tools: Tool definitions shared by every request
+            system_prompt: System instructions shared by every request
+            json_mode: Passed to complete_with_tools for every request
+
+        Returns:
+            List of provider-specific response objects, in input order
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def complete(messages: list[dict]) -> Any:
+            async with semaphore:
+                await self._pace()
+                return await self.provider.complete_with_tools(
+                    messages=messages,
+                    tools=tools,
+                    system_prompt=system_prompt,
+                    json_mode=json_mode,
+                )
+
+        return await asyncio.gather(*(complete(messages) for messages in messages_batch))
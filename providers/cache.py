@@ -0,0 +1,164 @@
+"""Exact-match response cache in front of LLM providers."""
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any
+
+from .base import LLMProvider, ProcessedResponse
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize SDK objects (e.g. Anthropic content blocks) kept in history."""
+    model_dump = getattr(value, "model_dump", None)
+    if model_dump is not None:
+        return model_dump()
+    return repr(value)
+
+
+def cache_key(
+    model: str,
+    system_prompt: str,
+    messages: list[dict],
+    tools: list[dict],
+    json_mode: bool = False,
+) -> str:
+    """Build a stable key for a completion request.
+
+    Tools are keyed by name only; their schemas are static per deployment.
+    """
+    digest = hashlib.blake2b(digest_size=32)
+    digest.update(model.encode())
+    digest.update(b"\0")
+    digest.update(system_prompt.encode())
+    digest.update(b"\0")
+    digest.update(json.dumps(messages, sort_keys=True, separators=(",", ":"), default=_json_default).encode())
+    digest.update(b"\0")
+    digest.update(",".join(tool["name"] for tool in tools or ()).encode())
+    digest.update(b"\0json" if json_mode else b"\0")
+    return digest.hexdigest()
+
+
+class LLMCache:
+    """In-memory LRU of completed responses with a time-to-live."""
+
+    def __init__(self, ttl: float, max_entries: int):
+        """Initialize the cache.
+
+        Args:
+            ttl: Seconds a cached response stays valid
+            max_entries: Maximum number of responses kept
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> Any | None:
+        """Return the cached response for key, or None if missing/expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, response = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return response
+
+    def set(self, key: str, response: Any) -> None:
+        """Store a response, evicting the least recently used entry if full."""
+        self._entries[key] = (time.monotonic() + self.ttl, response)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        self._entries.clear()
+
+
+class CachedResponse:
+    """Marker wrapping a response served from the cache."""
+
+    __slots__ = ("response",)
+
+    def __init__(self, response: Any):
+        self.response = response
+
+
+def _unwrap(response: Any) -> Any:
+    """Return the underlying provider response for cached or live responses."""
+    return response.response if isinstance(response, CachedResponse) else response
+
+
+class CachingProviderProxy(LLMProvider):
+    """LLMProvider that serves repeated identical requests from an LLMCache.
+
+    Only final responses (``is_complete`` is True) are cached; responses that
+    request tool calls always go to the wrapped provider. Cache hits report
+    zero token usage.
+    """
+
+    __slots__ = ("provider", "cache")
+
+    def __init__(self, provider: LLMProvider, cache: LLMCache):
+        super().__init__(provider._model_type, provider._requested_model)
+        self.provider = provider
+        self.cache = cache
+        self.model_name = provider.model_name
+
+    async def complete_with_tools(
+        self,
+        messages: list[dict],
+        tools: list[dict],
+        system_prompt: str,
+        json_mode: bool = False,
+    ) -> Any:
+        """Return a cached final response, or call the wrapped provider."""
+        key = cache_key(self.model_name, system_prompt, messages, tools, json_mode)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return CachedResponse(cached)
+
+        response = await self.provider.complete_with_tools(
+            messages=messages,
+            tools=tools,
+            system_prompt=system_prompt,
+            json_mode=json_mode,
+        )
+        if self.provider.is_complete(response):
+            self.cache.set(key, response)
+        return response
+
+    def parse_tool_calls(self, response: Any) -> list[Any]:
+        """Extract tool calls via the wrapped provider."""
+        return self.provider.parse_tool_calls(_unwrap(response))
+
+    def format_tool_result(self, tool_use_id: str, tool_name: str, result: str) -> dict:
+        """Format tool result via the wrapped provider."""
+        return self.provider.format_tool_result(tool_use_id, tool_name, result)
+
+    def is_complete(self, response: Any) -> bool:
+        """Check completion via the wrapped provider."""
+        return self.provider.is_complete(_unwrap(response))
+
+    def extract_final_response(self, response: Any) -> str:
+        """Extract final text via the wrapped provider."""
+        return self.provider.extract_final_response(_unwrap(response))
+
+    def format_assistant_message(self, response: Any) -> dict:
+        """Format assistant message via the wrapped provider."""
+        return self.provider.format_assistant_message(_unwrap(response))
+
+    def process_response(self, response: Any) -> ProcessedResponse:
+        """Process the response via the wrapped provider; cache hits cost nothing."""
+        processed = self.provider.process_response(_unwrap(response))
+        if isinstance(response, CachedResponse):
+            processed.usage = {"input_tokens": 0, "output_tokens": 0}
+        return processed
+
+    def get_usage(self, response: Any) -> dict:
+        """Extract token usage; cache hits cost nothing."""
+        if isinstance(response, CachedResponse):
+            return {"input_tokens": 0, "output_tokens": 0}
+        return self.provider.get_usage(response)
@@ -1,52 +1,102 @@
 """Factory for creating LLM provider instances."""
-import os
+from functools import lru_cache
+from importlib import import_module
+
 from .base import LLMProvider
-from .anthropic_provider import AnthropicProvider
-from .gemini_provider import GeminiProvider
-from .vertex_provider import VertexProvider
-from .openai_provider import OpenAIProvider
-from .openai_responses_provider import OpenAIResponsesProvider
-from config import LLM_PROVIDER, MODELS
+from . import _env
+from .cache import CachingProviderProxy, LLMCache
+from config import LLM_PROVIDER, MODEL_PROVIDER, LLM_CACHE_TTL, LLM_CACHE_MAX_ENTRIES
+
+
+# Shared across providers; keys include the model name
+_RESPONSE_CACHE = LLMCache(ttl=LLM_CACHE_TTL, max_entries=LLM_CACHE_MAX_ENTRIES)
+
+# Provider name -> (module, class). Modules are imported only when selected,
+# so the SDKs for unused providers are never loaded.
+_PROVIDER_SPECS: dict[str, tuple[str, str]] = {
+    "anthropic": (".anthropic_provider", "AnthropicProvider"),
+    "gemini": (".gemini_provider", "GeminiProvider"),       # Gemini Developer API
+    "vertex": (".vertex_provider", "VertexProvider"),       # Vertex AI platform
+    "openai": (".openai_provider", "OpenAIProvider"),       # Chat Completions API (default)
+}
+_OPENAI_RESPONSES_SPEC = (".openai_responses_provider", "OpenAIResponsesProvider")
+
+# Resolved provider classes, keyed by spec
+_PROVIDER_CLASSES: dict[tuple[str, str], type[LLMProvider]] = {}
+
+
+def _resolve_provider_class(spec: tuple[str, str]) -> type[LLMProvider]:
+    """Import the provider module for spec (once) and return its class."""
+    provider_class = _PROVIDER_CLASSES.get(spec)
+    if provider_class is None:
+        module_name, class_name = spec
+        provider_class = getattr(import_module(module_name, __package__), class_name)
+        _PROVIDER_CLASSES[spec] = provider_class
+    return provider_class
 
 
 def get_provider(provider_name: str | None = None, model_type: str | None = None, model: str | None = None) -> LLMProvider:
     """Factory to get LLM provider instance.
 
+    Instances are shared per (provider, model_type, model, OpenAI API mode)
+    so the underlying SDK client and its connection pool are reused across
+    requests. Providers hold no per-request state, so sharing is safe. Use
+    ``clear_provider_cache()`` to drop cached instances.
+
+    When ``config.LLM_CACHE_TTL`` is positive, the provider is wrapped in a
+    CachingProviderProxy so identical completed requests skip the API call.
+
     Args:
         provider_name: Name of the provider to use. If None, infers from model
                       or uses default from config.LLM_PROVIDER
         model_type: Optional model type for providers that support multiple
                    model families (e.g., 'gemini' for Vertex AI)
-        model: Optional model name. If provider not specified, infers provider
-              from model name using MODELS config.
+        model: Optional model name; must be listed in MODELS. If provider not
+              specified, infers provider from model name using MODELS config.
 
     Returns:
         LLMProvider instance
 
     Raises:
-        ValueError: If unknown provider name is specified
+        ValueError: If unknown provider name or model is specified
     """
     # Infer provider from model if not specified
     if provider_name is None and model:
-        provider_name = MODELS.get(model, {}).get("provider")
+        provider_name = MODEL_PROVIDER.get(model)
 
     name = provider_name or LLM_PROVIDER
 
-    providers = {
-        "anthropic": AnthropicProvider,
-        "gemini": GeminiProvider,      # Gemini Developer API
-        "vertex": VertexProvider,      # Vertex AI platform
-        "openai": OpenAIProvider,      # Chat Completions API (default)
-    }
+    # Both come straight from request bodies; checked here so arbitrary
+    # strings can't churn the instance cache (evicted genai clients are
+    # never closed). model_type only selects a Vertex model family.
+    if model and model not in MODEL_PROVIDER:
+        raise ValueError(f"Unknown model: {model}. Available: {list(MODEL_PROVIDER)}")
+    if name != "vertex":
+        model_type = None
+
+    # The OpenAI API mode is part of the cache key so reload_env() takes effect
+    api_mode = _env.OPENAI_API_MODE if name == "openai" else None
+    return _get_provider_cached(name, model_type, model, api_mode)
 
-    if name not in providers:
-        available = list(providers.keys())
+
+@lru_cache(maxsize=32)
+def _get_provider_cached(name: str, model_type: str | None, model: str | None, api_mode: str | None) -> LLMProvider:
+    """Build the provider instance for a resolved provider name and API mode."""
+    spec = _PROVIDER_SPECS.get(name)
+    if spec is None:
+        available = list(_PROVIDER_SPECS)
         raise ValueError(f"Unknown provider: {name}. Available: {available}")
 
     # For OpenAI, check if Responses API is requested via env
-    if name == "openai":
-        api_mode = os.environ.get("OPENAI_API_MODE", "completions")
-        if api_mode == "responses":
-            return OpenAIResponsesProvider(model_type=model_type, model=model)
+    if api_mode == "responses":
+        spec = _OPENAI_RESPONSES_SPEC
+
+    provider = _resolve_provider_class(spec)(model_type=model_type, model=model)
+    if LLM_CACHE_TTL > 0:
+        return CachingProviderProxy(provider, _RESPONSE_CACHE)
+    return provider
+
 
-    return providers[name](model_type=model_type, model=model)
+def clear_provider_cache() -> None:
+    """Drop shared provider instances, e.g. after ``_env.reload_env()``."""
+    _get_provider_cached.cache_clear()
@@ -1,41 +1,46 @@
 """OpenAI LLM provider implementation using Chat Completions API."""
-import os
-import json
-from openai import OpenAI
+from openai import AsyncOpenAI
 from typing import Any
-from dataclasses import dataclass
 
-from .base import LLMProvider
+try:
+    import orjson as _json  # C-accelerated; ~3-5x faster on small tool-arg payloads
+except ImportError:
+    import json as _json
+
+from .base import LLMProvider, ProcessedResponse, ToolCall, intern_schema, tools_cache_key
+from . import _env
+from ._http import get_openai_http_client
 
 
 # Default model configuration
 OPENAI_MAX_TOKENS = 4096
 DEFAULT_OPENAI_MODEL = "gpt-5-mini"
 
+# gpt-5-mini and gpt-5-nano only support temperature=1
+_FIXED_TEMP_MODELS = frozenset({"gpt-5-mini", "gpt-5-nano"})
 
-@dataclass
-class ToolCall:
-    """Represents a tool call from OpenAI."""
-    id: str
-    name: str
-    input: dict
+# Sent when the caller passes json_mode=True; guarantees the final text
+# parses on the first try
+_JSON_RESPONSE_FORMAT = {"type": "json_object"}
 
 
 class OpenAIProvider(LLMProvider):
     """LLM provider for OpenAI models using Chat Completions API."""
 
+    __slots__ = ("client", "_default_temperature")
+
     def __init__(self, model_type: str | None = None, model: str | None = None):
         super().__init__(model_type, model)
-        self.client = OpenAI()
-        self._model = model or os.environ.get("OPENAI_MODEL", DEFAULT_OPENAI_MODEL)
-
-    @property
-    def model_name(self) -> str:
-        """Return the model name being used."""
-        return self._model
+        self.client = AsyncOpenAI(http_client=get_openai_http_client())
+        self.model_name = model or _env.OPENAI_MODEL or DEFAULT_OPENAI_MODEL
+        self._default_temperature = 1 if self.model_name in _FIXED_TEMP_MODELS else 0.7
 
     def _convert_tools(self, tools: list[dict]) -> list[dict]:
         """Convert Anthropic-format tools to OpenAI format."""
+        key = tools_cache_key(tools)
+        if self._tools_cache is not None and self._tools_cache[0] == key:
+            return self._tools_cache[1]
+
         openai_tools = []
         for tool in tools:
             openai_tools.append({
@@ -43,16 +48,18 @@ class OpenAIProvider(LLMProvider):
                 "function": {
                     "name": tool["name"],
                     "description": tool["description"],
-                    "parameters": tool.get("input_schema", {})
+                    "parameters": intern_schema(tool.get("input_schema", {}))
                 }
             })
+        self._tools_cache = (key, openai_tools)
         return openai_tools
 
     async def complete_with_tools(
         self,
         messages: list[dict],
         tools: list[dict],
-        system_prompt: str
+        system_prompt: str,
+        json_mode: bool = False,
     ) -> Any:
         """Send messages to OpenAI with tool definitions."""
         # Build messages with system prompt
@@ -62,32 +69,45 @@ class OpenAIProvider(LLMProvider):
         openai_tools = self._convert_tools(tools) if tools else None
 
         # Make the API call
-        # gpt-5-mini and gpt-5-nano only support temperature=1
         kwargs = {
-            "model": self._model,
+            "model": self.model_name,
             "messages": openai_messages,
             "max_completion_tokens": OPENAI_MAX_TOKENS,
-            "temperature": 1 if self._model in ("gpt-5-mini", "gpt-5-nano") else 0.7,
+            "temperature": self._default_temperature,
         }
+        if json_mode:
+            kwargs["response_format"] = _JSON_RESPONSE_FORMAT
 
         if openai_tools:
             kwargs["tools"] = openai_tools
             kwargs["tool_choice"] = "auto"
 
-        response = self.client.chat.completions.create(**kwargs)
+        response = await self.client.chat.completions.create(**kwargs)
 
         return response
 
     def _build_messages(self, messages: list[dict], system_prompt: str) -> list[dict]:
-        """Build OpenAI message list from conversation history."""
-        openai_messages = []
-
-        # Add system prompt first
-        if system_prompt:
-            openai_messages.append({
-                "role": "system",
-                "content": system_prompt
-            })
+        """Build OpenAI message list from conversation history.
+
+        Messages converted on a previous iteration of the same conversation
+        are reused; only newly appended messages are converted.
+        """
+        # Add system prompt first. Keeping it (and the history order) identical
+        # across iterations lets OpenAI's automatic prefix caching apply.
+        initial = [{"role": "system", "content": system_prompt}] if system_prompt else None
+        return self._extend_converted(messages, self._convert_messages, initial, key=system_prompt)
+
+    def _convert_messages(self, messages: list[dict], openai_messages: list[dict]) -> None:
+        """Append OpenAI-format messages for the given history slice."""
+        # Fast path: plain string turns (e.g. a fresh chat) map one-to-one
+        if all(
+            isinstance(msg.get("content"), str) and "tool_calls" not in msg and msg.get("role") != "system"
+            for msg in messages
+        ):
+            openai_messages.extend(
+                {"role": msg.get("role", "user"), "content": msg["content"]} for msg in messages
+            )
+            return
 
         for msg in messages:
             role = msg.get("role", "user")
@@ -122,8 +142,6 @@ class OpenAIProvider(LLMProvider):
                             "content": item.get("content", "")
                         })
 
-        return openai_messages
-
     def parse_tool_calls(self, response: Any) -> list[ToolCall]:
         """Extract tool calls from OpenAI's response."""
         tool_calls = []
@@ -136,8 +154,8 @@ class OpenAIProvider(LLMProvider):
         if message.tool_calls:
             for tc in message.tool_calls:
                 try:
-                    args = json.loads(tc.function.arguments) if tc.function.arguments else {}
-                except json.JSONDecodeError:
+                    args = _json.loads(tc.function.arguments) if tc.function.arguments else {}
+                except _json.JSONDecodeError:
                     args = {}
 
                 tool_calls.append(ToolCall(
@@ -211,6 +229,51 @@ class OpenAIProvider(LLMProvider):
 
         return result
 
+    def process_response(self, response: Any) -> ProcessedResponse:
+        """Walk the first choice once for completion, tool calls, text and usage."""
+        usage = self.get_usage(response)
+        if not response.choices:
+            return ProcessedResponse(True, [], None, "", usage)
+
+        choice = response.choices[0]
+        message = choice.message
+        content = message.content or ""
+
+        tool_calls = []
+        assistant_message = None
+        if message.tool_calls:
+            assistant_calls = []
+            for tc in message.tool_calls:
+                function = tc.function
+                arguments = function.arguments
+                try:
+                    args = _json.loads(arguments) if arguments else {}
+                except _json.JSONDecodeError:
+                    args = {}
+
+                tool_calls.append(ToolCall(id=tc.id, name=function.name, input=args))
+                assistant_calls.append({
+                    "id": tc.id,
+                    "type": "function",
+                    "function": {
+                        "name": function.name,
+                        "arguments": arguments
+                    }
+                })
+
+            assistant_message = {"role": "assistant"}
+            if content:
+                assistant_message["content"] = content
+            assistant_message["tool_calls"] = assistant_calls
+
+        return ProcessedResponse(
+            is_complete=choice.finish_reason == "stop" or not tool_calls,
+            tool_calls=tool_calls,
+            assistant_message=assistant_message,
+            final_text=content,
+            usage=usage,
+        )
+
     def get_usage(self, response: Any) -> dict:
         """Extract token usage from OpenAI's response."""
         if hasattr(response, 'usage') and response.usage:
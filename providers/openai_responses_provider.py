@@ -1,56 +1,64 @@
 """OpenAI LLM provider implementation using Responses API."""
-import os
-import json
-from openai import OpenAI
+import io
+from openai import AsyncOpenAI
 from typing import Any
-from dataclasses import dataclass
 
-from .base import LLMProvider
+try:
+    import orjson as _json  # C-accelerated; ~3-5x faster on small tool-arg payloads
+except ImportError:
+    import json as _json
+
+from .base import LLMProvider, ToolCall, intern_schema, tools_cache_key
+from . import _env
+from ._http import get_openai_http_client
 
 
 # Default model configuration
 OPENAI_MAX_TOKENS = 4096
 DEFAULT_OPENAI_MODEL = "gpt-5-mini"
 
+# gpt-5-mini and gpt-5-nano only support temperature=1
+_FIXED_TEMP_MODELS = frozenset({"gpt-5-mini", "gpt-5-nano"})
 
-@dataclass
-class ToolCall:
-    """Represents a tool call from OpenAI."""
-    id: str
-    name: str
-    input: dict
+# Sent when the caller passes json_mode=True; guarantees the final text
+# parses on the first try
+_JSON_TEXT_FORMAT = {"format": {"type": "json_object"}}
 
 
 class OpenAIResponsesProvider(LLMProvider):
     """LLM provider for OpenAI models using Responses API."""
 
+    __slots__ = ("client", "_default_temperature")
+
     def __init__(self, model_type: str | None = None, model: str | None = None):
         super().__init__(model_type, model)
-        self.client = OpenAI()
-        self._model = model or os.environ.get("OPENAI_MODEL", DEFAULT_OPENAI_MODEL)
-
-    @property
-    def model_name(self) -> str:
-        """Return the model name being used."""
-        return self._model
+        self.client = AsyncOpenAI(http_client=get_openai_http_client())
+        self.model_name = model or _env.OPENAI_MODEL or DEFAULT_OPENAI_MODEL
+        self._default_temperature = 1 if self.model_name in _FIXED_TEMP_MODELS else 0.7
 
     def _convert_tools(self, tools: list[dict]) -> list[dict]:
         """Convert Anthropic-format tools to OpenAI Responses API format."""
+        key = tools_cache_key(tools)
+        if self._tools_cache is not None and self._tools_cache[0] == key:
+            return self._tools_cache[1]
+
         openai_tools = []
         for tool in tools:
             openai_tools.append({
                 "type": "function",
                 "name": tool["name"],
                 "description": tool["description"],
-                "parameters": tool.get("input_schema", {})
+                "parameters": intern_schema(tool.get("input_schema", {}))
             })
+        self._tools_cache = (key, openai_tools)
         return openai_tools
 
     async def complete_with_tools(
         self,
         messages: list[dict],
         tools: list[dict],
-        system_prompt: str
+        system_prompt: str,
+        json_mode: bool = False,
     ) -> Any:
         """Send messages to OpenAI Responses API with tool definitions."""
         # Build input from messages
@@ -59,25 +67,44 @@ class OpenAIResponsesProvider(LLMProvider):
         # Convert tools to Responses API format
         openai_tools = self._convert_tools(tools) if tools else None
 
-        # gpt-5-mini and gpt-5-nano only support temperature=1
         kwargs = {
-            "model": self._model,
+            "model": self.model_name,
             "input": input_items,
             "instructions": system_prompt,
             "max_output_tokens": OPENAI_MAX_TOKENS,
-            "temperature": 1 if self._model in ("gpt-5-mini", "gpt-5-nano") else 0.7,
+            "temperature": self._default_temperature,
             "store": False,  # Don't store responses server-side
         }
+        if json_mode:
+            kwargs["text"] = _JSON_TEXT_FORMAT
 
         if openai_tools:
             kwargs["tools"] = openai_tools
             kwargs["tool_choice"] = "auto"
 
-        return self.client.responses.create(**kwargs)
+        return await self.client.responses.create(**kwargs)
 
     def _build_input(self, messages: list[dict]) -> list[dict]:
-        """Build OpenAI Responses API input from conversation history."""
-        input_items = []
+        """Build OpenAI Responses API input from conversation history.
+
+        Items converted on a previous iteration of the same conversation are
+        reused; only newly appended messages are converted.
+        """
+        return self._extend_converted(messages, self._convert_input)
+
+    def _convert_input(self, messages: list[dict], input_items: list[dict]) -> None:
+        """Append Responses API input items for the given history slice."""
+        # Fast path: plain string user turns (e.g. a fresh request) map one-to-one
+        if all(msg.get("role", "user") == "user" and isinstance(msg.get("content"), str) for msg in messages):
+            input_items.extend(
+                {
+                    "type": "message",
+                    "role": "user",
+                    "content": [{"type": "input_text", "text": msg["content"]}]
+                }
+                for msg in messages
+            )
+            return
 
         for msg in messages:
             role = msg.get("role", "user")
@@ -114,8 +141,6 @@ class OpenAIResponsesProvider(LLMProvider):
                             "output": item.get("content", "")
                         })
 
-        return input_items
-
     def parse_tool_calls(self, response: Any) -> list[ToolCall]:
         """Extract function calls from OpenAI Responses API response."""
         tool_calls = []
@@ -123,8 +148,8 @@ class OpenAIResponsesProvider(LLMProvider):
         for item in response.output:
             if item.type == "function_call":
                 try:
-                    args = json.loads(item.arguments) if item.arguments else {}
-                except json.JSONDecodeError:
+                    args = _json.loads(item.arguments) if item.arguments else {}
+                except _json.JSONDecodeError:
                     args = {}
 
                 tool_calls.append(ToolCall(
@@ -159,37 +184,42 @@ class OpenAIResponsesProvider(LLMProvider):
 
     def extract_final_response(self, response: Any) -> str:
         """Extract text content from OpenAI Responses API response."""
-        text_parts = []
+        buf = io.StringIO()
+        write = buf.write
 
         for item in response.output:
             if item.type == "message" and item.role == "assistant":
                 for content in item.content:
                     if content.type == "output_text":
-                        text_parts.append(content.text)
+                        write(content.text)
 
-        return "".join(text_parts)
+        return buf.getvalue()
 
     def format_assistant_message(self, response: Any) -> dict:
         """Format OpenAI's response as an assistant message."""
         result = {"role": "assistant"}
 
-        text_parts = []
+        buf = io.StringIO()
+        write = buf.write
+        has_text = False
         function_calls = []
+        append = function_calls.append
 
         for item in response.output:
             if item.type == "message" and item.role == "assistant":
                 for content in item.content:
                     if content.type == "output_text":
-                        text_parts.append(content.text)
+                        write(content.text)
+                        has_text = True
             elif item.type == "function_call":
-                function_calls.append({
+                append({
                     "call_id": item.call_id,
                     "name": item.name,
                     "arguments": item.arguments
                 })
 
-        if text_parts:
-            result["content"] = "".join(text_parts)
+        if has_text:
+            result["content"] = buf.getvalue()
         if function_calls:
             result["function_calls"] = function_calls
 
@@ -1,11 +1,17 @@
 """Google Vertex AI LLM provider implementation."""
-import os
 from google import genai
 from google.genai import types
 from typing import Any
-from dataclasses import dataclass
 
-from .base import LLMProvider
+from .base import (
+    LLMProvider,
+    ProcessedResponse,
+    ToolCall,
+    args_to_dict,
+    intern_schema,
+    tools_cache_key,
+)
+from . import _env
 
 
 # Model type to model name mapping
@@ -21,20 +27,14 @@ DEFAULT_MODEL_TYPE = "gemini"
 DEFAULT_VERTEX_MODEL = "gemini-3-flash-preview"
 
 
-@dataclass
-class ToolCall:
-    """Represents a tool call from Vertex AI."""
-    id: str
-    name: str
-    input: dict
-
-
 class VertexProvider(LLMProvider):
     """LLM provider for Google Vertex AI platform."""
 
+    __slots__ = ("client", "_effective_type")
+
     def __init__(self, model_type: str | None = None, model: str | None = None):
         super().__init__(model_type, model)
-        api_key = os.environ.get("GOOGLE_CLOUD_API_KEY")
+        api_key = _env.GOOGLE_CLOUD_API_KEY
         if not api_key:
             raise ValueError("GOOGLE_CLOUD_API_KEY environment variable is required for Vertex provider")
 
@@ -42,7 +42,7 @@ class VertexProvider(LLMProvider):
 
         # Model override takes precedence
         if model:
-            self._model = model
+            self.model_name = model
             self._effective_type = model_type or DEFAULT_MODEL_TYPE
         else:
             # Use MODEL_MAP based on model_type, or env default
@@ -50,32 +50,34 @@ class VertexProvider(LLMProvider):
             if effective_type not in MODEL_MAP:
                 available = list(MODEL_MAP.keys())
                 raise ValueError(f"Unknown model type: {effective_type}. Available: {available}")
-            self._model = os.environ.get("VERTEX_MODEL", MODEL_MAP[effective_type])
+            self.model_name = _env.VERTEX_MODEL or MODEL_MAP[effective_type]
             self._effective_type = effective_type
 
-    @property
-    def model_name(self) -> str:
-        """Return the model name being used."""
-        return self._model
-
     def _convert_tools(self, tools: list[dict]) -> list[types.Tool]:
         """Convert Anthropic-format tools to Vertex AI format."""
+        key = tools_cache_key(tools)
+        if self._tools_cache is not None and self._tools_cache[0] == key:
+            return self._tools_cache[1]
+
         function_declarations = []
         for tool in tools:
             declaration = {
                 "name": tool["name"],
                 "description": tool["description"],
-                "parameters": tool.get("input_schema", {})
+                "parameters": intern_schema(tool.get("input_schema", {}))
             }
             function_declarations.append(declaration)
 
-        return [types.Tool(function_declarations=function_declarations)]
+        vertex_tools = [types.Tool(function_declarations=function_declarations)]
+        self._tools_cache = (key, vertex_tools)
+        return vertex_tools
 
     async def complete_with_tools(
         self,
         messages: list[dict],
         tools: list[dict],
-        system_prompt: str
+        system_prompt: str,
+        json_mode: bool = False,
     ) -> Any:
         """Send messages to Vertex AI with tool definitions."""
         contents = self._build_contents(messages)
@@ -95,8 +97,9 @@ class VertexProvider(LLMProvider):
         config = types.GenerateContentConfig(**config_dict)
         config.system_instruction = system_prompt
 
-        response = self.client.models.generate_content(
-            model=self._model,
+        # Make the API call through the async surface so the event loop isn't blocked
+        response = await self.client.aio.models.generate_content(
+            model=self.model_name,
             contents=contents,
             config=config,
         )
@@ -104,61 +107,93 @@ class VertexProvider(LLMProvider):
         return response
 
     def _build_contents(self, messages: list[dict]) -> list[types.Content]:
-        """Build Vertex AI content list from messages."""
-        contents = []
+        """Build Vertex AI content list from messages.
+
+        Contents converted on a previous iteration of the same conversation
+        are reused; only newly appended messages are converted.
+        """
+        return self._extend_converted(messages, self._convert_contents)
+
+    def _convert_contents(self, messages: list[dict], contents: list[types.Content]) -> None:
+        """Append Vertex AI contents for the given history slice."""
+        Content = types.Content
+        Part = types.Part
+        append = contents.append
 
-        for msg in messages:
+        # System prompt goes via config.system_instruction; empty turns carry nothing
+        for msg in [m for m in messages if m.get("content") and m.get("role") != "system"]:
             role = msg.get("role", "user")
-            content = msg.get("content")
+            content = msg["content"]
 
             if role == "assistant":
                 role = "model"
-            elif role == "system":
-                continue
 
             if isinstance(content, str):
-                contents.append(
-                    types.Content(
-                        role=role,
-                        parts=[types.Part.from_text(text=content)]
-                    )
-                )
+                append(Content(role=role, parts=[Part.from_text(text=content)]))
             elif isinstance(content, list):
                 parts = []
                 for item in content:
                     if isinstance(item, dict) and item.get("type") == "tool_result":
                         parts.append(
-                            types.Part.from_function_response(
+                            Part.from_function_response(
                                 name=item.get("tool_name", "unknown"),
                                 response={"result": item.get("content", "")}
                             )
                         )
                 if parts:
-                    contents.append(types.Content(role=role, parts=parts))
+                    append(Content(role=role, parts=parts))
 
-        return contents
+    def _scan_parts(self, response: Any) -> tuple[str, list[ToolCall], list[dict]]:
+        """Walk the first candidate's parts once.
 
-    def parse_tool_calls(self, response: Any) -> list[ToolCall]:
-        """Extract function calls from Vertex AI's response."""
-        tool_calls = []
-
-        if not response.candidates:
-            return tool_calls
+        Returns:
+            Tuple of (joined text, tool calls, assistant message parts). The
+            result is cached on the response so the is_complete /
+            parse_tool_calls / extract_final_response / format_assistant_message
+            calls for one response share a single walk.
+        """
+        scanned = response.__dict__.get("_scanned")
+        if scanned is not None:
+            return scanned
 
-        candidate = response.candidates[0]
-        if not candidate.content or not candidate.content.parts:
-            return tool_calls
-
-        for i, part in enumerate(candidate.content.parts):
-            if hasattr(part, "function_call") and part.function_call:
-                fc = part.function_call
+        text_parts = []
+        tool_calls = []
+        message_parts = []
+        append_part = message_parts.append
+
+        candidates = response.candidates
+        content = candidates[0].content if candidates else None
+        parts = content.parts if content else None
+
+        for i, part in enumerate(parts or ()):
+            text = getattr(part, "text", None)
+            fc = getattr(part, "function_call", None)
+            args = args_to_dict(fc.args) if fc else None
+
+            if text:
+                text_parts.append(text)
+                append_part({"type": "text", "text": text})
+            elif fc:
+                append_part({
+                    "type": "function_call",
+                    "name": fc.name,
+                    "args": args
+                })
+
+            if fc:
                 tool_calls.append(ToolCall(
                     id=f"vertex_tool_{i}",
                     name=fc.name,
-                    input=dict(fc.args) if fc.args else {}
+                    input=args
                 ))
 
-        return tool_calls
+        scanned = ("".join(text_parts), tool_calls, message_parts)
+        response.__dict__["_scanned"] = scanned
+        return scanned
+
+    def parse_tool_calls(self, response: Any) -> list[ToolCall]:
+        """Extract function calls from Vertex AI's response."""
+        return self._scan_parts(response)[1]
 
     def format_tool_result(self, tool_use_id: str, tool_name: str, result: str) -> dict:
         """Format tool result for Vertex AI's expected format."""
@@ -171,59 +206,29 @@ class VertexProvider(LLMProvider):
 
     def is_complete(self, response: Any) -> bool:
         """Check if Vertex AI is done (no more tool calls needed)."""
-        if not response.candidates:
-            return True
-
-        candidate = response.candidates[0]
-
-        if not candidate.content or not candidate.content.parts:
-            return True
-
-        # Check for function calls FIRST - if there are any, we're not complete
-        for part in candidate.content.parts:
-            if hasattr(part, "function_call") and part.function_call:
-                return False
-
-        return True
+        # Any function call means we're not complete
+        return not self._scan_parts(response)[1]
 
     def extract_final_response(self, response: Any) -> str:
         """Extract text content from Vertex AI's response."""
-        if not response.candidates:
-            return ""
-
-        candidate = response.candidates[0]
-        if not candidate.content or not candidate.content.parts:
-            return ""
-
-        text_parts = []
-        for part in candidate.content.parts:
-            if hasattr(part, "text") and part.text:
-                text_parts.append(part.text)
-
-        return "".join(text_parts)
+        return self._scan_parts(response)[0]
 
     def format_assistant_message(self, response: Any) -> dict:
         """Format Vertex AI's response as an assistant message."""
-        if not response.candidates:
-            return {"role": "model", "content": ""}
-
-        candidate = response.candidates[0]
-
-        parts = []
-        if candidate.content and candidate.content.parts:
-            for part in candidate.content.parts:
-                if hasattr(part, "text") and part.text:
-                    parts.append({"type": "text", "text": part.text})
-                elif hasattr(part, "function_call") and part.function_call:
-                    fc = part.function_call
-                    parts.append({
-                        "type": "function_call",
-                        "name": fc.name,
-                        "args": dict(fc.args) if fc.args else {}
-                    })
-
+        parts = self._scan_parts(response)[2]
         return {"role": "model", "content": parts if parts else ""}
 
+    def process_response(self, response: Any) -> ProcessedResponse:
+        """Build everything the agent loop needs from one parts scan."""
+        text, tool_calls, parts = self._scan_parts(response)
+        return ProcessedResponse(
+            is_complete=not tool_calls,
+            tool_calls=tool_calls,
+            assistant_message={"role": "model", "content": parts if parts else ""} if tool_calls else None,
+            final_text=text,
+            usage=self.get_usage(response),
+        )
+
     def get_usage(self, response: Any) -> dict:
         """Extract token usage from Vertex AI's response."""
         if hasattr(response, 'usage_metadata') and response.usage_metadata:
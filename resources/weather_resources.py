@@ -1,7 +1,69 @@
 """MCP Resources for weather data."""
+import time
+from collections import Counter
+
 from config import NWS_API_BASE
+from utils.bounded_cache import put_bounded
 from utils.http_client import make_nws_request
 
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+NATIONAL_ALERTS_URL = f"{NWS_API_BASE}/alerts/active?status=actual&message_type=alert"
+
+# Rendered resource TTLs (seconds): alerts change on a minute scale, station lists rarely
+NATIONAL_ALERTS_TTL = 60
+STATIONS_TTL = 3600
+# Station keys come from client input, so the cache is bounded like the others
+RESOURCE_CACHE_MAX_ENTRIES = 128
+
+_resource_cache: dict[str, tuple[float, str]] = {}
+
+
+if msgspec is not None:
+    # Typed decode reads only each alert's event name and skips the rest of
+    # the (often multi-megabyte) GeoJSON without building dicts for it
+    class _AlertProperties(msgspec.Struct):
+        event: str | None = "Unknown"
+
+    class _AlertFeature(msgspec.Struct):
+        properties: _AlertProperties
+
+    class _AlertCollection(msgspec.Struct):
+        features: list[_AlertFeature] | None = None
+
+    _decode_alerts = msgspec.json.Decoder(_AlertCollection).decode
+
+
+async def _fetch_national_alert_events() -> list[str | None] | None:
+    """Return the event name of every active US alert, or None on failure."""
+    if msgspec is not None:
+        data = await make_nws_request(NATIONAL_ALERTS_URL, decode=_decode_alerts)
+        if not data or data.features is None:
+            return None
+        return [feature.properties.event for feature in data.features]
+
+    data = await make_nws_request(NATIONAL_ALERTS_URL)
+    if not data or "features" not in data:
+        return None
+    return [feature["properties"].get("event", "Unknown") for feature in data["features"]]
+
+
+def _get_cached(key: str) -> str | None:
+    """Return a rendered resource if it hasn't expired."""
+    entry = _resource_cache.get(key)
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+
+def _set_cached(key: str, value: str, ttl: float) -> str:
+    """Store a rendered resource for ttl seconds and return it."""
+    put_bounded(_resource_cache, key, (time.monotonic() + ttl, value), RESOURCE_CACHE_MAX_ENTRIES)
+    return value
 
 WEATHER_GLOSSARY = """
 # Weather Terminology Glossary
@@ -64,6 +126,11 @@ def register_resources(mcp):
         Args:
             state: Two-letter US state code (e.g., CA, NY)
         """
+        cache_key = f"stations:{state}"
+        cached = _get_cached(cache_key)
+        if cached is not None:
+            return cached
+
         url = f"{NWS_API_BASE}/stations?state={state}"
         data = await make_nws_request(url)
 
@@ -71,7 +138,7 @@ def register_resources(mcp):
             return f"Unable to fetch stations for state: {state}"
 
         if not data["features"]:
-            return f"No stations found for state: {state}"
+            return _set_cached(cache_key, f"No stations found for state: {state}", STATIONS_TTL)
 
         stations = []
         for feature in data["features"][:50]:
@@ -82,33 +149,34 @@ def register_resources(mcp):
                 f"({coords[1]:.4f}, {coords[0]:.4f})"
             )
 
-        return f"Weather Stations in {state.upper()}:\n\n" + "\n".join(stations)
+        result = f"Weather Stations in {state.upper()}:\n\n" + "\n".join(stations)
+        return _set_cached(cache_key, result, STATIONS_TTL)
 
     @mcp.resource("weather://alerts/national")
     async def get_national_alerts() -> str:
         """Summary of all active weather alerts in the US."""
-        url = f"{NWS_API_BASE}/alerts/active?status=actual&message_type=alert"
-        data = await make_nws_request(url)
+        cached = _get_cached("alerts:national")
+        if cached is not None:
+            return cached
 
-        if not data or "features" not in data:
+        events = await _fetch_national_alert_events()
+
+        if events is None:
             return "Unable to fetch national alerts."
 
-        if not data["features"]:
-            return "No active weather alerts nationwide."
+        if not events:
+            return _set_cached("alerts:national", "No active weather alerts nationwide.", NATIONAL_ALERTS_TTL)
 
-        alert_counts = {}
-        for feature in data["features"]:
-            event = feature["properties"].get("event", "Unknown")
-            alert_counts[event] = alert_counts.get(event, 0) + 1
+        alert_counts = Counter(events)
 
         result = [
             f"National Weather Alert Summary",
-            f"Total Active Alerts: {len(data['features'])}",
+            f"Total Active Alerts: {len(events)}",
             "",
             "Alerts by Type:",
         ]
 
-        for event, count in sorted(alert_counts.items(), key=lambda x: -x[1]):
+        for event, count in alert_counts.most_common():
             result.append(f"  - {event}: {count}")
 
-        return "\n".join(result)
+        return _set_cached("alerts:national", "\n".join(result), NATIONAL_ALERTS_TTL)
@@ -1,29 +1,44 @@
+import logging
 import uvicorn
 import os
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Configure logging for the process (library modules only create loggers)
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s | %(levelname)s | %(message)s',
+    datefmt='%H:%M:%S'
+)
+
 from fastmcp import FastMCP
 from starlette.middleware.cors import CORSMiddleware
 from starlette.routing import Route
 from starlette.responses import JSONResponse
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from tools import register_all_tools
 from resources import register_all_resources
 from prompts import register_all_prompts
+from providers import clear_provider_cache, close_http_clients
+from utils.http_client import close_client
 
-# Initialize FastMCP server
-mcp = FastMCP("weather")
 
-# Register all tools, resources, and prompts
-register_all_tools(mcp)
-register_all_resources(mcp)
-register_all_prompts(mcp)
+if orjson is not None:
+    class ORJSONResponse(JSONResponse):
+        """JSONResponse rendered by orjson, which emits UTF-8 bytes directly."""
 
-# Get the internal Starlette app
-app = mcp.sse_app()
+        def render(self, content) -> bytes:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+else:
+    ORJSONResponse = JSONResponse
 
 
 # Blanket REST API endpoint - LLM interprets any request
@@ -38,6 +53,7 @@ async def services_api(request):
         "provider": "anthropic",                             # Optional (anthropic, openai, gemini, vertex)
         "type": "gemini",                                    # Optional (model type for vertex provider)
         "model": "gpt-5-nano",                               # Optional (override default model)
+        "max_tokens_budget": 20000,                          # Optional (token budget before wrapping up)
         "meta": true,                                        # Optional (include all meta info)
         # OR "meta": ["usage", "cost"],                      # Optional (include specific meta fields)
         "raw": false                                         # Optional (return unwrapped response)
@@ -51,13 +67,13 @@ async def services_api(request):
     try:
         body = await request.json()
     except Exception:
-        return JSONResponse(
+        return ORJSONResponse(
             {"error": "Invalid JSON body"},
             status_code=400
         )
 
     if "request" not in body:
-        return JSONResponse(
+        return ORJSONResponse(
             {"error": "Missing required field: request"},
             status_code=400
         )
@@ -74,7 +90,7 @@ async def services_api(request):
 
     # Validate: raw=true and meta are mutually exclusive
     if raw is True and meta:
-        return JSONResponse(
+        return ORJSONResponse(
             {"error": "Cannot combine 'raw: true' with 'meta'. Raw mode returns unwrapped response without metadata. Remove 'raw' to include meta information, or vice versa."},
             status_code=400
         )
@@ -82,32 +98,74 @@ async def services_api(request):
     try:
         agent = ServiceAgent(provider_name=provider, model_type=model_type, model=model)
         result = await agent.process_request(body, meta_fields=meta, raw=raw)
-        return JSONResponse(result)
+        return ORJSONResponse(result)
     except ValueError as e:
         # Invalid provider name, model type, or model
-        return JSONResponse({"error": str(e)}, status_code=400)
+        return ORJSONResponse({"error": str(e)}, status_code=400)
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             {"error": f"Internal error: {str(e)}"},
             status_code=500
         )
 
 
-# Add REST API route
-app.routes.append(Route("/api/services", services_api, methods=["POST"]))
+def create_app():
+    """Build the FastMCP server and return its Starlette app with the REST API.
 
+    Each call builds an independent instance, e.g. for
+    ``uvicorn server:create_app --factory``.
+    """
+    mcp = FastMCP("weather")
 
-# Add CORS middleware to allow requests from any origin
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+    # Register all tools, resources, and prompts
+    register_all_tools(mcp)
+    register_all_resources(mcp)
+    register_all_prompts(mcp)
+
+    # Get the internal Starlette app
+    app = mcp.sse_app()
+
+    # Close the shared outbound HTTP clients after FastMCP's own lifespan exits
+    mcp_lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def lifespan(app):
+        async with mcp_lifespan(app) as state:
+            yield state
+        await close_client()
+        clear_provider_cache()  # Cached providers hold the clients closed below
+        await close_http_clients()
+
+    app.router.lifespan_context = lifespan
+
+    # Add REST API route
+    app.routes.append(Route("/api/services", services_api, methods=["POST"]))
+
+    # Add CORS middleware to allow requests from any origin
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    return app
+
+
+app = create_app()
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 8080))
     print(f"Starting MCP server on 0.0.0.0:{port}...")
     print(f"REST API available at: http://0.0.0.0:{port}/api/services")
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # uvicorn[standard] provides uvloop and httptools; name them so a missing
+    # extra fails loudly instead of silently falling back to asyncio + h11
+    workers = int(os.environ.get("WEB_CONCURRENCY", 1))
+    if workers > 1:
+        # Each worker imports this module and serves the app built at import
+        uvicorn.run(
+            "server:app", workers=workers,
+            host="0.0.0.0", port=port, loop="uvloop", http="httptools",
+        )
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=port, loop="uvloop", http="httptools")
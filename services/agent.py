@@ -1,21 +1,28 @@
 """Service Agent - LLM-powered intelligent service layer."""
+import asyncio
 import json
-import re
 import logging
 import time
+import weakref
 from typing import Any
 
 from providers import get_provider
-from services.tool_registry import TOOLS, TOOL_FUNCTIONS
-from config import MODELS
+from services.json_extract import extract_json
+from services.result_cache import normalize_request, result_cache_key, result_cache_ttl
+from services.tool_registry import TOOLS, TOOL_FUNCTIONS, TOOL_VALIDATORS
+from config import AGENT_TOKEN_BUDGET, MODEL_PROVIDER
+from utils.bounded_cache import put_bounded
+
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        """Serialize obj to a compact JSON string."""
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _dumps = json.dumps
 
-# Configure logging
 logger = logging.getLogger(__name__)
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s | %(levelname)s | %(message)s',
-    datefmt='%H:%M:%S'
-)
 
 
 SYSTEM_PROMPT = """You are an automated service agent in an agentic workflow. Your job is to:
@@ -46,6 +53,7 @@ SYSTEM_PROMPT = """You are an automated service agent in an agentic workflow. Yo
 ## Guidelines
 
 - If a location is given, use geocode_location first to get coordinates
+- For several locations, request all geocode_location calls in one turn, then all weather calls in the next; calls in the same turn run in parallel
 - If 'output_format' specifies keys, use those EXACT key names in your response
 - If 'output_format' specifies units (e.g., "fahrenheit"), convert accordingly
 - Use 'context' to better understand the user's intent
@@ -70,6 +78,92 @@ Response: {"t": 12, "h": 78}
 Request: "Amsterdam forecast for 3 days"
 Response: {"location": "Amsterdam", "forecast": [{"date": "2025-01-07", "high": 8, "low": 3}, {"date": "2025-01-08", "high": 7, "low": 2}, {"date": "2025-01-09", "high": 9, "low": 4}]}"""
 
+# Sent as a final user turn once the token budget is spent
+BUDGET_DIRECTIVE = (
+    "Token budget reached. Do not call any more tools. "
+    "Respond now with the final JSON using only the data you already have."
+)
+
+
+_LOG_RULE = "=" * 60
+
+
+# Final results cache: freshness depends on what was asked for
+RESULT_CACHE_MAX_ENTRIES = 1024
+
+_result_cache: dict[str, tuple[float, dict]] = {}
+
+
+def _parse_budget(value: Any) -> int:
+    """Validate a request's max_tokens_budget, defaulting to AGENT_TOKEN_BUDGET when absent.
+
+    Raises:
+        ValueError: If the value is not a positive whole number
+    """
+    if value is None:
+        return AGENT_TOKEN_BUDGET
+    budget = None
+    if isinstance(value, int) and not isinstance(value, bool):
+        budget = value
+    elif isinstance(value, str) and value.strip().isdigit():
+        budget = int(value)
+    if budget is None or budget <= 0:
+        raise ValueError(f"max_tokens_budget must be a positive integer, got {value!r}")
+    return budget
+
+
+def _result_cache_key(model: str, request: dict) -> str:
+    """Hash the model and the request fields that shape the answer."""
+    return result_cache_key({
+        "m": model,
+        "r": normalize_request(request.get("request")),
+        "c": request.get("context"),
+        "o": request.get("output_format"),
+    })
+
+
+def _store_result(cache_key: str, request: dict, result: dict) -> None:
+    """Cache a successful result with an intent-based TTL."""
+    if "error" in result:
+        return
+    expires_at = time.monotonic() + result_cache_ttl(request.get("request"))
+    put_bounded(_result_cache, cache_key, (expires_at, result), RESULT_CACHE_MAX_ENTRIES)
+
+
+# Tool output fed back to the model is capped so one bulky result can't
+# inflate every later iteration's prompt
+MAX_TOOL_RESULT_CHARS = 4000
+
+
+def _cap_tool_result(result: str) -> str:
+    """Truncate a tool result to MAX_TOOL_RESULT_CHARS, noting what was dropped."""
+    if len(result) <= MAX_TOOL_RESULT_CHARS:
+        return result
+    return f"{result[:MAX_TOOL_RESULT_CHARS]}\n[truncated {len(result) - MAX_TOOL_RESULT_CHARS} chars]"
+
+
+# Deterministic tools whose results can be reused within one request
+MEMOIZED_TOOLS = frozenset({"geocode_location", "get_sunrise_sunset"})
+
+
+# Upper bound on tool calls hitting the weather backends at once, across requests
+MAX_PARALLEL_TOOLS = 8
+
+# One semaphore per running event loop; asyncio primitives bind to the first
+# loop that waits on them, so a module-level one breaks a second loop
+_tool_semaphores: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _tool_semaphore() -> asyncio.Semaphore:
+    """Return the running loop's tool-call semaphore, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    semaphore = _tool_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _tool_semaphores[loop] = asyncio.Semaphore(MAX_PARALLEL_TOOLS)
+    return semaphore
+
 
 class ServiceAgent:
     """LLM-powered agent that interprets requests and uses tools."""
@@ -87,6 +181,13 @@ class ServiceAgent:
         """
         self.provider = get_provider(provider_name, model_type, model)
 
+        # Fixed for the provider's lifetime; read on every completed request
+        pricing = self.provider.pricing
+        self._input_rate = pricing["input"] / 1_000_000  # Per token
+        self._output_rate = pricing["output"] / 1_000_000
+        self._model_name = self.provider.model_name
+        self._provider_name = MODEL_PROVIDER.get(self._model_name, "unknown")
+
     async def process_request(self, request: dict, meta_fields: list | bool | None = None, raw: bool = False) -> dict:
         """Process a request and return structured JSON response.
 
@@ -95,6 +196,9 @@ class ServiceAgent:
                 - request: The user's request (required)
                 - context: Optional context to help interpret the request
                 - output_format: Optional dict with keys/units preferences
+                - cache_bypass: Optional; if true, skip the result cache
+                - max_tokens_budget: Optional cumulative token budget
+                  (defaults to AGENT_TOKEN_BUDGET)
             meta_fields: If True, include all meta info. If list, include specific fields.
                         Available: model, provider, iterations, usage, cost, latency_ms, tools, logs
             raw: If True, return unwrapped response (backward compatibility)
@@ -103,16 +207,34 @@ class ServiceAgent:
             Dict with structured response data, optionally wrapped in {"data": ..., "meta": ...}
         """
         start_time = time.time()
+        user_request = request.get("request", "")
+        budget = _parse_budget(request.get("max_tokens_budget"))
         tools_used = []  # Track tool calls: {"name": str, "input": dict, "iteration": int}
-        logs = []  # Track execution logs
+        logs = []  # Track execution logs, only when the caller asked for them
+        collect_logs = meta_fields is True or (isinstance(meta_fields, list) and "logs" in meta_fields)
+
+        # Identical recent requests are answered without calling the LLM
+        use_cache = not request.get("cache_bypass")
+        cache_key = _result_cache_key(self._model_name, request)
+        if use_cache:
+            entry = _result_cache.get(cache_key)
+            if entry is not None and entry[0] > time.monotonic():
+                logger.info("CACHE HIT: %.100s", user_request)
+                return self._wrap_response(
+                    entry[1], meta_fields, raw,
+                    0, 0, 0, tools_used, ["CACHE HIT"], start_time
+                )
 
-        user_message = self._build_user_message(request)
+        user_message = self._build_user_message(request, user_request)
+        # Append-only: providers reuse the converted prefix of this list on
+        # each iteration, so earlier turns must never be replaced or edited
         messages = [{"role": "user", "content": user_message}]
+        tool_cache = {}  # (tool name, canonical args) -> result, for MEMOIZED_TOOLS
 
-        logger.info(f"{'='*60}")
-        logger.info(f"REQUEST: {request.get('request', '')[:100]}")
+        logger.info(_LOG_RULE)
+        logger.info("REQUEST: %.100s", user_request)
         if request.get('context'):
-            logger.info(f"CONTEXT: {request.get('context')}")
+            logger.info("CONTEXT: %s", request.get('context'))
 
         # Token tracking
         total_input_tokens = 0
@@ -121,95 +243,153 @@ class ServiceAgent:
         # Agentic loop - keep calling LLM until it's done
         max_iterations = 10  # Safety limit
         iteration = 0
+        previous_calls = None  # Tool-call signature of the last iteration
+        over_budget = False  # Set once the wrap-up directive has been sent
+        loop_detected = False
 
         while iteration < max_iterations:
             iteration += 1
-            logger.info(f"--- Iteration {iteration} ---")
+            logger.info("--- Iteration %d ---", iteration)
+
+            # Past the budget, ask for a final answer from what's been gathered.
+            # Tools stay declared because the history holds tool-use turns.
+            # The directive goes in as a user turn so SYSTEM_PROMPT stays
+            # byte-identical and provider prompt caches keep hitting.
+            if not over_budget and total_input_tokens + total_output_tokens > budget:
+                over_budget = True
+                logger.warning("BUDGET EXCEEDED: %d tokens", total_input_tokens + total_output_tokens)
+                if collect_logs:
+                    logs.append(f"[{iteration}] BUDGET EXCEEDED - requesting final response")
+                messages.append({"role": "user", "content": BUDGET_DIRECTIVE})
 
             response = await self.provider.complete_with_tools(
                 messages=messages,
                 tools=TOOLS,
-                system_prompt=SYSTEM_PROMPT
+                system_prompt=SYSTEM_PROMPT,
+                json_mode=True,  # SYSTEM_PROMPT demands raw JSON
             )
 
+            # Single pass over the response for everything used below
+            processed = self.provider.process_response(response)
+
             # Track tokens
-            usage = self.provider.get_usage(response)
+            usage = processed.usage
             total_input_tokens += usage["input_tokens"]
             total_output_tokens += usage["output_tokens"]
 
-            # Check if LLM is done (no more tool calls)
-            if self.provider.is_complete(response):
-                final_text = self.provider.extract_final_response(response)
-                logger.info(f"MODEL COMPLETE - generating response")
-                logs.append(f"[{iteration}] MODEL COMPLETE")
-                result = self._parse_json_response(final_text)
-                logger.info(f"RESPONSE: {json.dumps(result)[:200]}...")
-                self._log_cost(total_input_tokens, total_output_tokens)
-                logger.info(f"{'='*60}")
+            tool_calls = processed.tool_calls
+
+            # A reply without tool calls is terminal, whether or not the
+            # provider flagged the turn complete; parse whatever text it has
+            if processed.is_complete or not tool_calls:
+                if processed.is_complete:
+                    logger.info("MODEL COMPLETE - generating response")
+                    if collect_logs:
+                        logs.append(f"[{iteration}] MODEL COMPLETE")
+                else:
+                    logger.info("NO TOOL CALLS - extracting response")
+                    if collect_logs:
+                        logs.append(f"[{iteration}] NO TOOL CALLS - extracting response")
+                result = self._parse_json_response(processed.final_text)
+                if use_cache:
+                    _store_result(cache_key, request, result)
+                if logger.isEnabledFor(logging.INFO):
+                    # Format the summary after the caller has its result
+                    asyncio.get_running_loop().call_soon(
+                        self._log_done, result, total_input_tokens, total_output_tokens
+                    )
                 return self._wrap_response(
                     result, meta_fields, raw,
                     total_input_tokens, total_output_tokens,
                     iteration, tools_used, logs, start_time
                 )
 
-            # Handle tool calls
-            tool_calls = self.provider.parse_tool_calls(response)
+            if over_budget:
+                break  # Still asking for tools after the wrap-up call
 
-            if not tool_calls:
-                # No tool calls but not complete - extract whatever we have
-                final_text = self.provider.extract_final_response(response)
-                logger.info(f"NO TOOL CALLS - extracting response")
-                logs.append(f"[{iteration}] NO TOOL CALLS - extracting response")
-                result = self._parse_json_response(final_text)
-                return self._wrap_response(
-                    result, meta_fields, raw,
-                    total_input_tokens, total_output_tokens,
-                    iteration, tools_used, logs, start_time
-                )
+            # The exact same calls as last turn would just repeat last turn's results
+            call_signature = sorted((tc.name, json.dumps(tc.input, sort_keys=True)) for tc in tool_calls)
+            if call_signature == previous_calls:
+                loop_detected = True
+                break
+            previous_calls = call_signature
 
             # Add assistant's response to conversation
-            messages.append(self.provider.format_assistant_message(response))
+            messages.append(processed.assistant_message)
 
-            # Execute each tool and collect results
-            tool_results = []
+            log_calls = collect_logs or logger.isEnabledFor(logging.INFO)
             for tool_call in tool_calls:
-                logger.info(f"TOOL CALL: {tool_call.name}({json.dumps(tool_call.input)})")
                 tools_used.append({
                     "name": tool_call.name,
                     "input": tool_call.input,
                     "iteration": iteration
                 })
-                logs.append(f"[{iteration}] TOOL: {tool_call.name}({json.dumps(tool_call.input)})")
-                tool_result = await self._execute_tool(tool_call)
-                logger.info(f"TOOL RESULT: {tool_result[:150]}..." if len(tool_result) > 150 else f"TOOL RESULT: {tool_result}")
+                if log_calls:
+                    args_json = _dumps(tool_call.input)
+                    logger.info("TOOL CALL: %s(%s)", tool_call.name, args_json)
+                    if collect_logs:
+                        logs.append(f"[{iteration}] TOOL: {tool_call.name}({args_json})")
+
+            # Execute the tools concurrently; results come back in call order
+            outputs = await asyncio.gather(
+                *(self._execute_tool(tool_call, tool_cache) for tool_call in tool_calls),
+                return_exceptions=True
+            )
+
+            tool_results = []
+            for tool_call, tool_result in zip(tool_calls, outputs):
+                if isinstance(tool_result, BaseException):
+                    tool_result = f"Error executing {tool_call.name}: {str(tool_result)}"
+                if logger.isEnabledFor(logging.INFO):
+                    if len(tool_result) > 150:
+                        logger.info("TOOL RESULT: %.150s...", tool_result)
+                    else:
+                        logger.info("TOOL RESULT: %s", tool_result)
                 tool_results.append(
-                    self.provider.format_tool_result(tool_call.id, tool_call.name, tool_result)
+                    self.provider.format_tool_result(tool_call.id, tool_call.name, _cap_tool_result(tool_result))
                 )
 
             # Add tool results to conversation
             messages.append({"role": "user", "content": tool_results})
 
-        # If we hit max iterations, return error
-        logger.error("MAX ITERATIONS REACHED")
-        logs.append(f"[{iteration}] ERROR: Max iterations reached")
-        result = {"error": "Max iterations reached", "partial_data": None}
+        if loop_detected:
+            logger.error("LOOP DETECTED: repeated tool calls")
+            if collect_logs:
+                logs.append(f"[{iteration}] ERROR: LLM loop detected")
+            result = {"error": "LLM loop detected", "partial_data": None}
+        elif over_budget:
+            logger.error("TOKEN BUDGET EXHAUSTED")
+            if collect_logs:
+                logs.append(f"[{iteration}] ERROR: Token budget exceeded")
+            result = {"error": "Token budget exceeded", "partial_data": None}
+        else:
+            # If we hit max iterations, return error
+            logger.error("MAX ITERATIONS REACHED")
+            if collect_logs:
+                logs.append(f"[{iteration}] ERROR: Max iterations reached")
+            result = {"error": "Max iterations reached", "partial_data": None}
         return self._wrap_response(
             result, meta_fields, raw,
             total_input_tokens, total_output_tokens,
             iteration, tools_used, logs, start_time
         )
 
+    def _log_done(self, result: dict, input_tokens: int, output_tokens: int) -> None:
+        """Log the final response and its cost."""
+        logger.info("RESPONSE: %.200s...", _dumps(result))
+        self._log_cost(input_tokens, output_tokens)
+        logger.info(_LOG_RULE)
+
     def _log_cost(self, input_tokens: int, output_tokens: int) -> None:
         """Log token usage and estimated cost."""
-        pricing = self.provider.pricing
-        input_cost = (input_tokens / 1_000_000) * pricing["input"]
-        output_cost = (output_tokens / 1_000_000) * pricing["output"]
+        input_cost = input_tokens * self._input_rate
+        output_cost = output_tokens * self._output_rate
         total_cost = input_cost + output_cost
 
         logger.info(
-            f"MODEL: {self.provider.model_name} | "
-            f"TOKENS: {input_tokens} in / {output_tokens} out | "
-            f"COST: ${total_cost:.6f} (${input_cost:.6f} + ${output_cost:.6f})"
+            "MODEL: %s | TOKENS: %d in / %d out | COST: $%.6f ($%.6f + $%.6f)",
+            self._model_name, input_tokens, output_tokens,
+            total_cost, input_cost, output_cost
         )
 
     def _wrap_response(
@@ -285,16 +465,16 @@ class ServiceAgent:
             Dict with requested meta fields
         """
         all_fields = meta_fields is True
-        fields = meta_fields if isinstance(meta_fields, list) else []
+        # Set for O(1) membership; non-string entries can't name a field anyway
+        fields = {f for f in meta_fields if isinstance(f, str)} if isinstance(meta_fields, list) else set()
 
         meta = {}
 
         if all_fields or "model" in fields:
-            meta["model"] = self.provider.model_name
+            meta["model"] = self._model_name
 
         if all_fields or "provider" in fields:
-            model_config = MODELS.get(self.provider.model_name, {})
-            meta["provider"] = model_config.get("provider", "unknown")
+            meta["provider"] = self._provider_name
 
         if all_fields or "iterations" in fields:
             meta["iterations"] = iterations
@@ -306,9 +486,8 @@ class ServiceAgent:
             }
 
         if all_fields or "cost" in fields:
-            pricing = self.provider.pricing
-            input_cost = (input_tokens / 1_000_000) * pricing["input"]
-            output_cost = (output_tokens / 1_000_000) * pricing["output"]
+            input_cost = input_tokens * self._input_rate
+            output_cost = output_tokens * self._output_rate
             meta["cost"] = {
                 "input": round(input_cost, 6),
                 "output": round(output_cost, 6),
@@ -326,71 +505,74 @@ class ServiceAgent:
 
         return meta
 
-    def _build_user_message(self, request: dict) -> str:
+    def _build_user_message(self, request: dict, user_request: str) -> str:
         """Build the user message from request parameters."""
-        user_request = request.get("request", "")
         context = request.get("context", "")
         output_format = request.get("output_format")
 
+        # Common case: a bare request needs no assembly
+        if not context and not output_format:
+            return user_request
+
         parts = [user_request]
 
         if context:
             parts.append(f"\nContext: {context}")
 
-        if output_format:
-            if isinstance(output_format, dict):
-                if "keys" in output_format:
-                    parts.append(f"\nOutput keys (use these exact names): {output_format['keys']}")
-                if "units" in output_format:
-                    parts.append(f"\nUnits: {output_format['units']}")
-            else:
-                parts.append(f"\nOutput format: {output_format}")
+        if isinstance(output_format, dict):
+            if "keys" in output_format:
+                parts.append(f"\nOutput keys (use these exact names): {output_format['keys']}")
+            if "units" in output_format:
+                parts.append(f"\nUnits: {output_format['units']}")
+        elif output_format:
+            parts.append(f"\nOutput format: {output_format}")
 
         return "".join(parts)
 
-    async def _execute_tool(self, tool_call: Any) -> str:
-        """Execute a tool call and return the result as string."""
+    async def _execute_tool(self, tool_call: Any, tool_cache: dict | None = None) -> str:
+        """Execute a tool call and return the result as string.
+
+        When ``tool_cache`` is given, results of MEMOIZED_TOOLS are looked up
+        and stored there, so a repeated call within one request is free.
+        """
         tool_name = tool_call.name
         tool_input = tool_call.input
 
+        cache_key = None
+        if tool_cache is not None and tool_name in MEMOIZED_TOOLS:
+            cache_key = (tool_name, json.dumps(tool_input, sort_keys=True))
+            cached = tool_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
         func = TOOL_FUNCTIONS.get(tool_name)
         if not func:
             return f"Error: Unknown tool '{tool_name}'"
 
         try:
-            result = await func(**tool_input)
-            return result
+            tool_input = TOOL_VALIDATORS[tool_name](tool_input)  # Numeric strings become numbers
+        except ValueError as e:
+            return f"Error: Invalid arguments for {tool_name}: {str(e)}"
+
+        try:
+            async with _tool_semaphore():
+                result = await func(**tool_input)
         except Exception as e:
             return f"Error executing {tool_name}: {str(e)}"
 
+        if cache_key is not None:
+            tool_cache[cache_key] = result
+        return result
+
     def _parse_json_response(self, text: str) -> dict:
         """Parse JSON from LLM response text."""
         if not text:
             return {"error": "Empty response from LLM"}
 
-        # Try to parse the text as JSON directly
         try:
-            return json.loads(text)
-        except json.JSONDecodeError:
+            return extract_json(text)
+        except ValueError:
             pass
 
-        # Try to extract JSON from markdown code blocks
-        json_pattern = r'```(?:json)?\s*([\s\S]*?)\s*```'
-        matches = re.findall(json_pattern, text)
-        for match in matches:
-            try:
-                return json.loads(match)
-            except json.JSONDecodeError:
-                continue
-
-        # Try to find JSON object in the text
-        brace_pattern = r'\{[\s\S]*\}'
-        matches = re.findall(brace_pattern, text)
-        for match in matches:
-            try:
-                return json.loads(match)
-            except json.JSONDecodeError:
-                continue
-
         # If all parsing fails, return the raw text in an error response
         return {"error": "Could not parse JSON from response", "raw_response": text}
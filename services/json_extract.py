@@ -0,0 +1,74 @@
+"""Extract a JSON value from free-form LLM response text."""
+from typing import Any
+
+try:
+    import orjson as _json  # C-accelerated; both error types subclass ValueError
+except ImportError:
+    import json as _json
+
+
+def _strip_fence(text: str) -> str:
+    """Return the body of text that starts with a ```/```json fence."""
+    body = text[3:].removeprefix("json")
+    end = body.rfind("```")
+    return (body[:end] if end != -1 else body).strip()
+
+
+def _balanced_objects(text: str):
+    """Yield each balanced top-level ``{...}`` span, skipping braces inside strings."""
+    start = text.find("{")
+    while start != -1:
+        depth = 0
+        in_string = False
+        escape = False
+        for i in range(start, len(text)):
+            char = text[i]
+            if in_string:
+                if escape:
+                    escape = False
+                elif char == "\\":
+                    escape = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char == "{":
+                depth += 1
+            elif char == "}":
+                depth -= 1
+                if depth == 0:
+                    yield text[start:i + 1]
+                    break
+        else:
+            return  # Unbalanced to the end of the text
+        start = text.find("{", i + 1)
+
+
+def extract_json(text: str) -> Any:
+    """Parse the JSON value in an LLM reply.
+
+    Tries, in order: the whole text, the body of a leading code fence, and
+    each balanced ``{...}`` object found by a single forward scan.
+
+    Raises:
+        ValueError: If no JSON value can be parsed from the text
+    """
+    try:
+        return _json.loads(text)
+    except _json.JSONDecodeError:
+        pass
+
+    stripped = text.strip()
+    if stripped.startswith("```"):
+        try:
+            return _json.loads(_strip_fence(stripped))
+        except _json.JSONDecodeError:
+            pass
+
+    for candidate in _balanced_objects(text):
+        try:
+            return _json.loads(candidate)
+        except _json.JSONDecodeError:
+            continue
+
+    raise ValueError("No JSON object found in text")
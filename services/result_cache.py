@@ -0,0 +1,41 @@
+"""Keys and freshness for the agents' final-result caches."""
+import hashlib
+import json
+from typing import Any
+
+
+RESULT_CACHE_DEFAULT_TTL = 120  # Current conditions
+RESULT_CACHE_INTENT_TTLS = (
+    (("forecast", "tomorrow", "next week", "days"), 900),
+    (("air quality", "aqi", "pollution", "pollen"), 600),
+)
+
+
+def normalize_request(text: Any) -> Any:
+    """Fold case, whitespace and trailing punctuation out of a request string.
+
+    "Weather in Paris?" and "weather  in paris" ask the same thing and
+    should share a result cache entry.
+    """
+    if not isinstance(text, str):
+        return text
+    return " ".join(text.casefold().split()).rstrip("?!. ")
+
+
+def result_cache_key(fields: dict) -> str:
+    """Hash the request fields that shape an answer.
+
+    Values may be any JSON-like data (or anything ``str`` can render), so
+    dict and list request fields can't break the lookup.
+    """
+    payload = json.dumps(fields, sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def result_cache_ttl(query: Any) -> int:
+    """Pick a result-cache TTL from a request's apparent intent."""
+    text = str(query or "").lower()
+    for keywords, ttl in RESULT_CACHE_INTENT_TTLS:
+        if any(keyword in text for keyword in keywords):
+            return ttl
+    return RESULT_CACHE_DEFAULT_TTL
@@ -3,10 +3,29 @@
 This module defines:
 1. TOOLS - Tool schemas for the LLM to understand available functions
 2. TOOL_FUNCTIONS - Mapping of tool names to async implementation functions
+3. TOOL_VALIDATORS - Mapping of tool names to precompiled input validators
 """
+import asyncio
+import functools
+import math
+import time
+from datetime import date as date_type, datetime, timedelta, timezone
+from itertools import islice
+from types import MappingProxyType
+from typing import Any
+
 from config import NWS_API_BASE, OPEN_METEO_API_BASE, SUNRISE_SUNSET_API_BASE
+from services.tool_schema import get_validator
+from tools.global_tools import _aqi_to_level, _weather_code_to_description
+from tools.utility_tools import SUNRISE_CACHE_TTL
+from utils.bounded_cache import put_bounded
 from utils.http_client import make_request, make_nws_request, make_nominatim_request
 
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
 
 # Tool schemas for Claude (Anthropic format)
 TOOLS = [
@@ -114,39 +133,188 @@ TOOLS = [
 ]
 
 
-# Weather code descriptions
-WEATHER_CODES = {
-    0: "Clear sky", 1: "Mainly clear", 2: "Partly cloudy", 3: "Overcast",
-    45: "Foggy", 48: "Depositing rime fog",
-    51: "Light drizzle", 53: "Moderate drizzle", 55: "Dense drizzle",
-    61: "Slight rain", 63: "Moderate rain", 65: "Heavy rain",
-    71: "Slight snow", 73: "Moderate snow", 75: "Heavy snow", 77: "Snow grains",
-    80: "Slight rain showers", 81: "Moderate rain showers", 82: "Violent rain showers",
-    85: "Slight snow showers", 86: "Heavy snow showers",
-    95: "Thunderstorm", 96: "Thunderstorm with slight hail", 99: "Thunderstorm with heavy hail"
-}
+# Geocodes don't change; Nominatim's usage policy asks clients to cache them
+GEOCODE_TTL = 30 * 24 * 3600
+GEOCODE_MISS_TTL = 24 * 3600  # Empty answers, in case the index gains the place
+GEOCODE_MAX_ENTRIES = 4096
+
+_geocode_cache: dict[str, tuple[float, str]] = {}
+
+
+def _geocode_key(query: str) -> str:
+    """Canonicalize a place query so trivially different spellings share an entry."""
+    return " ".join(query.casefold().replace(",", " ").split())
+
+
+def _store_geocode(key: str, result: str, ttl: float) -> str:
+    """Cache a geocode result for ttl seconds and return it."""
+    put_bounded(_geocode_cache, key, (time.monotonic() + ttl, result), GEOCODE_MAX_ENTRIES)
+    return result
+
+
+# Active alerts change quickly, so they are only reused briefly
+ALERTS_TTL = 60
+
+_alerts_cache: dict[str, tuple[float, str]] = {}
+
+
+# Coordinate-keyed weather caches: 2 decimal places is roughly 1 km
+COORD_CACHE_PRECISION = 2
+COORD_CACHE_MAX_ENTRIES = 1024
+
 
+def ttl_cache_by_coords(ttl_seconds: float, precision: int = COORD_CACHE_PRECISION):
+    """Cache a (latitude, longitude, ...) tool's result per rounded coordinate.
 
-def _weather_code_to_description(code: int) -> str:
-    return WEATHER_CODES.get(code, f"Unknown ({code})")
+    Concurrent calls for the same key share one in-flight request. Failure
+    messages ("Unable to ...") are returned but not cached.
+    """
+    def decorator(func):
+        cache: dict[tuple, tuple[float, str]] = {}
+        inflight: dict[tuple, asyncio.Future] = {}
+
+        @functools.wraps(func)
+        async def wrapper(latitude: float, longitude: float, *args, **kwargs) -> str:
+            key = (round(latitude, precision), round(longitude, precision), *args, *sorted(kwargs.items()))
+            entry = cache.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1]
+
+            task = inflight.get(key)
+            if task is None:
+                task = inflight[key] = asyncio.ensure_future(func(latitude, longitude, *args, **kwargs))
+                task.add_done_callback(lambda _: inflight.pop(key, None))
+
+            # Shielded so one cancelled caller doesn't cancel the others
+            result = await asyncio.shield(task)
+            if not result.startswith("Unable to"):
+                put_bounded(cache, key, (time.monotonic() + ttl_seconds, result), COORD_CACHE_MAX_ENTRIES)
+            return result
+
+        return wrapper
+    return decorator
+
+
+# Per-row output templates, parsed once instead of per f-string evaluation
+_FORECAST_TEMPLATE = (
+    "Date: {}\n"
+    "Conditions: {}\n"
+    "High: {}°C\n"
+    "Low: {}°C\n"
+    "Precipitation: {}mm\n"
+    "Max Wind: {} km/h"
+)
+_HOURLY_TEMPLATE = "{}: {}°C, {}, Humidity: {}%, Wind: {} km/h"
+_ALERT_TEMPLATE = (
+    "Event: {}\n"
+    "Area: {}\n"
+    "Severity: {}\n"
+    "Description: {}..."
+)
+
+
+# Open-Meteo columns read by the forecast tools, in template order
+_FORECAST_FIELDS = (
+    "time", "weathercode", "temperature_2m_max",
+    "temperature_2m_min", "precipitation_sum", "windspeed_10m_max",
+)
+_HOURLY_FIELDS = ("time", "temperature_2m", "weathercode", "relative_humidity_2m", "windspeed_10m")
+
+if msgspec is not None:
+    # Typed decode builds only the columns used below and skips the rest of
+    # the response (units, metadata) without materializing dicts for it
+    class _DailyForecast(msgspec.Struct):
+        time: list[Any]
+        weathercode: list[Any]
+        temperature_2m_max: list[Any]
+        temperature_2m_min: list[Any]
+        precipitation_sum: list[Any]
+        windspeed_10m_max: list[Any]
+
+    class _ForecastResponse(msgspec.Struct):
+        daily: _DailyForecast | None = None
+
+    class _HourlyForecast(msgspec.Struct):
+        time: list[Any]
+        temperature_2m: list[Any]
+        weathercode: list[Any]
+        relative_humidity_2m: list[Any]
+        windspeed_10m: list[Any]
+
+    class _HourlyResponse(msgspec.Struct):
+        hourly: _HourlyForecast | None = None
+
+    _decode_forecast = msgspec.json.Decoder(_ForecastResponse).decode
+    _decode_hourly = msgspec.json.Decoder(_HourlyResponse).decode
+else:
+    _decode_forecast = _decode_hourly = None  # make_request's default JSON decode
+
+
+def _columns(data: Any, section: str, fields: tuple[str, ...]) -> list | None:
+    """Return the named columns of a response section, typed or plain-dict."""
+    if not data:
+        return None
+    if isinstance(data, dict):
+        block = data.get(section)
+        return [block[field] for field in fields] if block is not None else None
+    block = getattr(data, section)
+    return [getattr(block, field) for field in fields] if block is not None else None
 
 
-def _aqi_to_level(aqi: float) -> str:
-    if aqi <= 50: return "Good"
-    elif aqi <= 100: return "Moderate"
-    elif aqi <= 150: return "Unhealthy for Sensitive Groups"
-    elif aqi <= 200: return "Unhealthy"
-    elif aqi <= 300: return "Very Unhealthy"
-    else: return "Hazardous"
+# Sun centre 0.833 degrees below the horizon: refraction plus the solar radius
+_SUN_ZENITH_COS = math.cos(math.radians(90.833))
+
+
+def _solar_times(latitude: float, longitude: float, day: date_type) -> tuple[datetime, datetime, datetime] | None:
+    """Compute UTC sunrise, sunset and solar noon with NOAA's general solar position formulas.
+
+    Accurate to about a minute. Returns None when the sun doesn't rise or set
+    that day (polar day or night).
+    """
+    days_in_year = 366 if day.year % 4 == 0 and (day.year % 100 != 0 or day.year % 400 == 0) else 365
+    gamma = 2 * math.pi / days_in_year * (day.timetuple().tm_yday - 1)  # Fractional year at noon
+
+    eqtime = 229.18 * (
+        0.000075 + 0.001868 * math.cos(gamma) - 0.032077 * math.sin(gamma)
+        - 0.014615 * math.cos(2 * gamma) - 0.040849 * math.sin(2 * gamma)
+    )
+    decl = (
+        0.006918 - 0.399912 * math.cos(gamma) + 0.070257 * math.sin(gamma)
+        - 0.006758 * math.cos(2 * gamma) + 0.000907 * math.sin(2 * gamma)
+        - 0.002697 * math.cos(3 * gamma) + 0.00148 * math.sin(3 * gamma)
+    )
+
+    lat = math.radians(latitude)
+    cos_ha = _SUN_ZENITH_COS / (math.cos(lat) * math.cos(decl)) - math.tan(lat) * math.tan(decl)
+    if not -1.0 <= cos_ha <= 1.0:
+        return None
+    ha = math.degrees(math.acos(cos_ha))
+
+    midnight = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+    noon_minutes = 720 - 4 * longitude - eqtime
+    return (
+        midnight + timedelta(minutes=noon_minutes - 4 * ha),
+        midnight + timedelta(minutes=noon_minutes + 4 * ha),
+        midnight + timedelta(minutes=noon_minutes),
+    )
 
 
 # Tool implementation functions
 async def geocode_location(query: str) -> str:
     """Convert place name to coordinates."""
+    key = _geocode_key(query)
+    entry = _geocode_cache.get(key)
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+
     data = await make_nominatim_request("search", {"q": query, "limit": 3})
 
     if not data:
-        return "Unable to geocode location. Try a more specific query."
+        result = "Unable to geocode location. Try a more specific query."
+        if isinstance(data, list):
+            # An empty match list is a real answer, unlike a failed request (None)
+            return _store_geocode(key, result, GEOCODE_MISS_TTL)
+        return result
 
     if isinstance(data, list) and len(data) == 0:
         return f"No results found for '{query}'."
@@ -158,9 +326,10 @@ async def geocode_location(query: str) -> str:
         display_name = item.get("display_name", "Unknown")
         results.append(f"Location: {display_name}\nLatitude: {lat}\nLongitude: {lon}")
 
-    return "\n---\n".join(results)
+    return _store_geocode(key, "\n---\n".join(results), GEOCODE_TTL)
 
 
+@ttl_cache_by_coords(1800)
 async def get_global_forecast(latitude: float, longitude: float) -> str:
     """Get 7-day weather forecast."""
     url = f"{OPEN_METEO_API_BASE}/forecast"
@@ -170,54 +339,43 @@ async def get_global_forecast(latitude: float, longitude: float) -> str:
         "daily": "temperature_2m_max,temperature_2m_min,precipitation_sum,weathercode,windspeed_10m_max",
         "timezone": "auto"
     }
-    data = await make_request(url, params=params)
+    data = await make_request(url, params=params, decode=_decode_forecast)
 
-    if not data or "daily" not in data:
+    columns = _columns(data, "daily", _FORECAST_FIELDS)
+    if columns is None:
         return "Unable to fetch forecast."
 
-    daily = data["daily"]
-    forecasts = []
-    for i in range(len(daily["time"])):
-        weather_desc = _weather_code_to_description(daily["weathercode"][i])
-        forecasts.append(
-            f"Date: {daily['time'][i]}\n"
-            f"Conditions: {weather_desc}\n"
-            f"High: {daily['temperature_2m_max'][i]}°C\n"
-            f"Low: {daily['temperature_2m_min'][i]}°C\n"
-            f"Precipitation: {daily['precipitation_sum'][i]}mm\n"
-            f"Max Wind: {daily['windspeed_10m_max'][i]} km/h"
-        )
-    return "\n---\n".join(forecasts)
+    # Walk the columns together instead of re-indexing each one by key per day
+    return "\n---\n".join(
+        _FORECAST_TEMPLATE.format(date, _weather_code_to_description(code), high, low, precip, wind)
+        for date, code, high, low, precip, wind in zip(*columns)
+    )
 
 
+@ttl_cache_by_coords(900)
 async def get_global_hourly(latitude: float, longitude: float) -> str:
     """Get hourly forecast for next 24 hours."""
     url = f"{OPEN_METEO_API_BASE}/forecast"
     params = {
         "latitude": latitude,
         "longitude": longitude,
-        "hourly": "temperature_2m,precipitation,weathercode,windspeed_10m,relative_humidity_2m",
+        "hourly": "temperature_2m,weathercode,windspeed_10m,relative_humidity_2m",
         "timezone": "auto",
         "forecast_hours": 24
     }
-    data = await make_request(url, params=params)
+    data = await make_request(url, params=params, decode=_decode_hourly)
 
-    if not data or "hourly" not in data:
+    columns = _columns(data, "hourly", _HOURLY_FIELDS)
+    if columns is None:
         return "Unable to fetch hourly forecast."
 
-    hourly = data["hourly"]
-    forecasts = []
-    for i in range(min(24, len(hourly["time"]))):
-        weather_desc = _weather_code_to_description(hourly["weathercode"][i])
-        forecasts.append(
-            f"{hourly['time'][i]}: {hourly['temperature_2m'][i]}°C, "
-            f"{weather_desc}, "
-            f"Humidity: {hourly['relative_humidity_2m'][i]}%, "
-            f"Wind: {hourly['windspeed_10m'][i]} km/h"
-        )
-    return "\n".join(forecasts)
+    return "\n".join(
+        _HOURLY_TEMPLATE.format(time_, temp, _weather_code_to_description(code), humidity, wind)
+        for time_, temp, code, humidity, wind in islice(zip(*columns), 24)
+    )
 
 
+@ttl_cache_by_coords(300)
 async def get_current_weather(latitude: float, longitude: float) -> str:
     """Get current weather conditions."""
     url = f"{OPEN_METEO_API_BASE}/forecast"
@@ -244,6 +402,7 @@ async def get_current_weather(latitude: float, longitude: float) -> str:
     )
 
 
+@ttl_cache_by_coords(600)
 async def get_air_quality(latitude: float, longitude: float) -> str:
     """Get air quality data."""
     url = "https://air-quality-api.open-meteo.com/v1/air-quality"
@@ -271,6 +430,7 @@ async def get_air_quality(latitude: float, longitude: float) -> str:
     )
 
 
+@ttl_cache_by_coords(1800)
 async def get_uv_index(latitude: float, longitude: float) -> str:
     """Get UV index."""
     url = f"{OPEN_METEO_API_BASE}/forecast"
@@ -295,18 +455,41 @@ async def get_uv_index(latitude: float, longitude: float) -> str:
     if "daily" in data:
         daily = data["daily"]
         result.append("\nDaily Max UV Index:")
-        for i in range(len(daily["time"])):
-            result.append(f"  {daily['time'][i]}: {daily['uv_index_max'][i]}")
+        for date, uv_max in zip(daily["time"], daily["uv_index_max"]):
+            result.append(f"  {date}: {uv_max}")
 
     return "\n".join(result)
 
 
 async def get_sunrise_sunset(latitude: float, longitude: float, date: str = "today") -> str:
     """Get sunrise and sunset times."""
+    if date == "today":
+        # Resolved here so the cache key names the day it answers for
+        date = datetime.now(timezone.utc).date().isoformat()
+    return await _sunrise_sunset(latitude, longitude, date)
+
+
+@ttl_cache_by_coords(SUNRISE_CACHE_TTL)
+async def _sunrise_sunset(latitude: float, longitude: float, date: str) -> str:
+    """Get sunrise and sunset times for an explicit date."""
+    # Computed locally for plain dates; the API handles polar days and other date formats
+    try:
+        day = date_type.fromisoformat(date)
+    except ValueError:
+        day = None
+    times = _solar_times(latitude, longitude, day) if day is not None else None
+    if times is not None:
+        sunrise, sunset, solar_noon = times
+        day_length_sec = int((sunset - sunrise).total_seconds())
+        return (
+            f"Sunrise: {sunrise.isoformat(timespec='seconds')}\n"
+            f"Sunset: {sunset.isoformat(timespec='seconds')}\n"
+            f"Solar Noon: {solar_noon.isoformat(timespec='seconds')}\n"
+            f"Day Length: {day_length_sec // 3600}h {(day_length_sec % 3600) // 60}m"
+        )
+
     url = f"{SUNRISE_SUNSET_API_BASE}/json"
-    params = {"lat": latitude, "lng": longitude, "formatted": 0}
-    if date != "today":
-        params["date"] = date
+    params = {"lat": latitude, "lng": longitude, "formatted": 0, "date": date}
 
     data = await make_request(url, params=params)
 
@@ -328,30 +511,37 @@ async def get_sunrise_sunset(latitude: float, longitude: float, date: str = "tod
 
 async def get_us_alerts(state: str) -> str:
     """Get US weather alerts."""
-    url = f"{NWS_API_BASE}/alerts/active/area/{state.upper()}"
+    area = state.upper()
+    entry = _alerts_cache.get(area)
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+
+    url = f"{NWS_API_BASE}/alerts/active/area/{area}"
     data = await make_nws_request(url)
 
     if not data or "features" not in data:
         return "Unable to fetch alerts or no alerts found."
 
     if not data["features"]:
-        return f"No active alerts for {state.upper()}."
-
-    alerts = []
-    for feature in data["features"][:5]:  # Limit to 5 alerts
-        props = feature["properties"]
-        alerts.append(
-            f"Event: {props.get('event', 'Unknown')}\n"
-            f"Area: {props.get('areaDesc', 'Unknown')}\n"
-            f"Severity: {props.get('severity', 'Unknown')}\n"
-            f"Description: {props.get('description', 'N/A')[:500]}..."
+        result = f"No active alerts for {area}."
+    else:
+        result = "\n---\n".join(
+            _ALERT_TEMPLATE.format(
+                props.get('event', 'Unknown'),
+                props.get('areaDesc', 'Unknown'),
+                props.get('severity', 'Unknown'),
+                props.get('description', 'N/A')[:500],
+            )
+            for props in (feature["properties"] for feature in data["features"][:5])  # Limit to 5 alerts
         )
 
-    return "\n---\n".join(alerts)
+    # Keyed on the area code, so the cache is bounded by the number of states
+    _alerts_cache[area] = (time.monotonic() + ALERTS_TTL, result)
+    return result
 
 
-# Map tool names to implementation functions
-TOOL_FUNCTIONS = {
+# Map tool names to implementation functions (read-only, like config's MODELS)
+TOOL_FUNCTIONS = MappingProxyType({
     "geocode_location": geocode_location,
     "get_global_forecast": get_global_forecast,
     "get_global_hourly": get_global_hourly,
@@ -360,4 +550,8 @@ TOOL_FUNCTIONS = {
     "get_uv_index": get_uv_index,
     "get_sunrise_sunset": get_sunrise_sunset,
     "get_us_alerts": get_us_alerts,
-}
+})
+
+
+# Input validators compiled once at import, keyed by tool name
+TOOL_VALIDATORS = MappingProxyType({tool["name"]: get_validator(tool["input_schema"]) for tool in TOOLS})
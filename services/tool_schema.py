@@ -0,0 +1,121 @@
+"""Compiled JSON-schema validators for tool inputs, built once per schema."""
+import math
+from typing import Any, Callable
+
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
+
+# JSON-schema primitive types -> Python types (bool is excluded from numbers)
+_JSON_TYPES = {
+    "string": str,
+    "number": (int, float),
+    "integer": int,
+    "boolean": bool,
+    "object": dict,
+    "array": list,
+}
+
+# id(schema) -> (schema, validator); the schema is kept alive so its id can't be reused
+_VALIDATORS: dict[int, tuple[dict, Callable[[Any], Any]]] = {}
+
+
+def _compile_basic(schema: dict) -> Callable[[Any], Any]:
+    """Build a validator for the flat object schemas used by the tool registry.
+
+    Used when fastjsonschema isn't installed; checks required keys and the
+    primitive type of each declared property.
+    """
+    required = tuple(schema.get("required", ()))
+    property_types = {
+        name: _JSON_TYPES[spec["type"]]
+        for name, spec in schema.get("properties", {}).items()
+        if spec.get("type") in _JSON_TYPES
+    }
+
+    def validate(data: Any) -> Any:
+        if not isinstance(data, dict):
+            raise ValueError("arguments must be an object")
+        for name in required:
+            if name not in data:
+                raise ValueError(f"missing required argument '{name}'")
+        for name, value in data.items():
+            expected = property_types.get(name)
+            if expected is None:
+                continue
+            if isinstance(value, bool) and expected is not bool:
+                raise ValueError(f"argument '{name}' has the wrong type")
+            if not isinstance(value, expected):
+                raise ValueError(f"argument '{name}' has the wrong type")
+        return data
+
+    return validate
+
+
+def _to_number(text: str) -> float | int:
+    """Parse a numeric string as int when it is whole, else float; reject inf/nan."""
+    text = text.strip()
+    try:
+        return int(text)
+    except ValueError:
+        value = float(text)
+    if not math.isfinite(value):
+        raise ValueError(f"non-finite number {text!r}")
+    return value
+
+
+# JSON-schema numeric types -> parser for numeric strings models send (e.g. "48.85")
+_NUMBER_PARSERS = {
+    "number": _to_number,
+    "integer": lambda text: int(text.strip()),
+}
+
+
+def _with_coercion(schema: dict, check: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """Wrap check so numeric strings in number/integer properties are converted first.
+
+    Models often quote coordinates; converting them here saves a tool-error
+    round trip. Unparseable strings are left for check to reject.
+    """
+    parsers = {
+        name: _NUMBER_PARSERS[spec["type"]]
+        for name, spec in schema.get("properties", {}).items()
+        if spec.get("type") in _NUMBER_PARSERS
+    }
+    if not parsers:
+        return check
+
+    def validate(data: Any) -> Any:
+        if isinstance(data, dict):
+            for name, parse in parsers.items():
+                value = data.get(name)
+                if isinstance(value, str):
+                    try:
+                        data = {**data, name: parse(value)}
+                    except ValueError:
+                        pass
+        return check(data)
+
+    return validate
+
+
+def get_validator(schema: dict) -> Callable[[Any], Any]:
+    """Return a compiled validator for schema, compiling it on first use.
+
+    The validator returns the (possibly coerced) arguments to call the tool
+    with, and raises ValueError when the data does not match.
+    """
+    entry = _VALIDATORS.get(id(schema))
+    if entry is not None and entry[0] is schema:
+        return entry[1]
+
+    if fastjsonschema is not None:
+        check = fastjsonschema.compile(schema)
+    else:
+        check = _compile_basic(schema)
+    validator = _with_coercion(schema, check)
+
+    _VALIDATORS[id(schema)] = (schema, validator)
+    return validator
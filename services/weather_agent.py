@@ -1,10 +1,13 @@
 """Weather Agent - LLM-powered intelligent weather service."""
-import json
-import re
+import asyncio
+import time
 from typing import Any
 
 from providers import get_provider
-from services.tool_registry import TOOLS, TOOL_FUNCTIONS
+from services.json_extract import extract_json
+from services.result_cache import normalize_request, result_cache_key, result_cache_ttl
+from services.tool_registry import TOOLS, TOOL_FUNCTIONS, TOOL_VALIDATORS
+from utils.bounded_cache import put_bounded
 
 
 SYSTEM_PROMPT = """You are an intelligent weather data service. Your job is to:
@@ -16,6 +19,7 @@ SYSTEM_PROMPT = """You are an intelligent weather data service. Your job is to:
 ## Guidelines
 
 - If the user provides a location name (not coordinates), use geocode_location first
+- For several locations (e.g. comparisons), request all geocode_location calls in one turn, then all weather calls in the next; calls in the same turn run in parallel
 - Choose the most appropriate tool(s) based on what the user asks for:
   - "current weather" / "right now" → get_current_weather
   - "forecast" / "next few days" → get_global_forecast
@@ -38,6 +42,23 @@ Your final response MUST be valid JSON. Example:
 Do not wrap the JSON in markdown code blocks or add any text before/after it."""
 
 
+# Answers to recent identical queries; freshness follows ServiceAgent's intent-based TTLs
+RESULT_CACHE_MAX_ENTRIES = 256
+
+_result_cache: dict[str, tuple[float, dict]] = {}
+
+
+def _result_cache_key(model: str, request: dict) -> str:
+    """Hash the model and the request fields that shape the answer."""
+    return result_cache_key({
+        "m": model,
+        "q": normalize_request(request.get("query", "")),
+        "s": request.get("service", ""),
+        "o": request.get("output_keys"),
+        "e": request.get("expectation", ""),
+    })
+
+
 class WeatherAgent:
     """LLM-powered weather agent that interprets queries and uses tools."""
 
@@ -59,11 +80,29 @@ class WeatherAgent:
                 - service: Optional hint for which tool to prioritize
                 - output_keys: Optional list of specific keys for response
                 - expectation: Optional guidance on format/units
+                - cache_bypass: Optional; if true, skip the result cache
 
         Returns:
             Dict with weather data structured per the request
         """
+        use_cache = not request.get("cache_bypass")
+        cache_key = _result_cache_key(self.provider.model_name, request)
+        if use_cache:
+            entry = _result_cache.get(cache_key)
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1]
+
+        result = await self._run_loop(request)
+        if "error" not in result:
+            expires_at = time.monotonic() + result_cache_ttl(request.get("query"))
+            put_bounded(_result_cache, cache_key, (expires_at, result), RESULT_CACHE_MAX_ENTRIES)
+        return result
+
+    async def _run_loop(self, request: dict) -> dict:
+        """Run the agentic tool loop for a request that missed the cache."""
         user_message = self._build_user_message(request)
+        # Append-only: providers reuse the converted prefix of this list on
+        # each iteration, so earlier turns must never be replaced or edited
         messages = [{"role": "user", "content": user_message}]
 
         # Agentic loop - keep calling LLM until it's done
@@ -76,31 +115,41 @@ class WeatherAgent:
             response = await self.provider.complete_with_tools(
                 messages=messages,
                 tools=TOOLS,
-                system_prompt=SYSTEM_PROMPT
+                system_prompt=SYSTEM_PROMPT,
+                json_mode=True,  # SYSTEM_PROMPT demands raw JSON
             )
 
+            # Single pass over the response for everything used below
+            processed = self.provider.process_response(response)
+
             # Check if LLM is done (no more tool calls)
-            if self.provider.is_complete(response):
-                final_text = self.provider.extract_final_response(response)
+            if processed.is_complete:
+                final_text = processed.final_text
                 return self._parse_json_response(final_text)
 
             # Handle tool calls
-            tool_calls = self.provider.parse_tool_calls(response)
+            tool_calls = processed.tool_calls
 
             if not tool_calls:
                 # No tool calls but not complete - extract whatever we have
-                final_text = self.provider.extract_final_response(response)
+                final_text = processed.final_text
                 return self._parse_json_response(final_text)
 
             # Add assistant's response to conversation
-            messages.append(self.provider.format_assistant_message(response))
+            messages.append(processed.assistant_message)
+
+            # Execute the tools concurrently; results come back in call order
+            outputs = await asyncio.gather(
+                *(self._execute_tool(tool_call) for tool_call in tool_calls),
+                return_exceptions=True
+            )
 
-            # Execute each tool and collect results
             tool_results = []
-            for tool_call in tool_calls:
-                result = await self._execute_tool(tool_call)
+            for tool_call, result in zip(tool_calls, outputs):
+                if isinstance(result, BaseException):
+                    result = f"Error executing {tool_call.name}: {str(result)}"
                 tool_results.append(
-                    self.provider.format_tool_result(tool_call.id, result)
+                    self.provider.format_tool_result(tool_call.id, tool_call.name, result)
                 )
 
             # Add tool results to conversation
@@ -145,6 +194,11 @@ class WeatherAgent:
         if not func:
             return f"Error: Unknown tool '{tool_name}'"
 
+        try:
+            tool_input = TOOL_VALIDATORS[tool_name](tool_input)  # Numeric strings become numbers
+        except ValueError as e:
+            return f"Error: Invalid arguments for {tool_name}: {str(e)}"
+
         try:
             result = await func(**tool_input)
             return result
@@ -163,29 +217,10 @@ class WeatherAgent:
         if not text:
             return {"error": "Empty response from LLM"}
 
-        # Try to parse the text as JSON directly
         try:
-            return json.loads(text)
-        except json.JSONDecodeError:
+            return extract_json(text)
+        except ValueError:
             pass
 
-        # Try to extract JSON from markdown code blocks
-        json_pattern = r'```(?:json)?\s*([\s\S]*?)\s*```'
-        matches = re.findall(json_pattern, text)
-        for match in matches:
-            try:
-                return json.loads(match)
-            except json.JSONDecodeError:
-                continue
-
-        # Try to find JSON object in the text
-        brace_pattern = r'\{[\s\S]*\}'
-        matches = re.findall(brace_pattern, text)
-        for match in matches:
-            try:
-                return json.loads(match)
-            except json.JSONDecodeError:
-                continue
-
         # If all parsing fails, return the raw text in an error response
         return {"error": "Could not parse JSON from response", "raw_response": text}
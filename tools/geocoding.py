@@ -1,6 +1,9 @@
 """Geocoding tools using Nominatim (OpenStreetMap) - works worldwide."""
 from utils.http_client import make_nominatim_request
 
+# ISO subdivision codes duplicate the named state/county components
+_SKIPPED_ADDRESS_KEYS = frozenset({"ISO3166-2-lvl4", "ISO3166-2-lvl6", "ISO3166-2-lvl15"})
+
 
 def register_geocoding_tools(mcp):
     """Register all geocoding tools with the MCP server."""
@@ -19,19 +22,12 @@ def register_geocoding_tools(mcp):
         if isinstance(data, list) and len(data) == 0:
             return f"No results found for '{query}'. Try a more specific query."
 
-        results = []
-        for item in data[:5]:
-            lat = item.get("lat", "N/A")
-            lon = item.get("lon", "N/A")
-            display_name = item.get("display_name", "Unknown")
-            location_type = item.get("type", "unknown")
-            results.append(
-                f"📍 {display_name}\n"
-                f"   Coordinates: {lat}, {lon}\n"
-                f"   Type: {location_type}"
-            )
-
-        return "\n\n".join(results)
+        return "\n\n".join(
+            f"📍 {item.get('display_name', 'Unknown')}\n"
+            f"   Coordinates: {item.get('lat', 'N/A')}, {item.get('lon', 'N/A')}\n"
+            f"   Type: {item.get('type', 'unknown')}"
+            for item in data[:5]
+        )
 
     @mcp.tool()
     async def reverse_geocode(latitude: float, longitude: float) -> str:
@@ -58,8 +54,10 @@ def register_geocoding_tools(mcp):
 
         if address:
             result.append("Address components:")
-            for key, value in address.items():
-                if key not in ["ISO3166-2-lvl4", "ISO3166-2-lvl6", "ISO3166-2-lvl15"]:
-                    result.append(f"  {key.replace('_', ' ').title()}: {value}")
+            result.extend(
+                f"  {key.replace('_', ' ').title()}: {value}"
+                for key, value in address.items()
+                if key not in _SKIPPED_ADDRESS_KEYS
+            )
 
         return "\n".join(result)
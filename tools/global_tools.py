@@ -1,17 +1,29 @@
 """Global weather tools using Open-Meteo API - works worldwide."""
+import json
+from bisect import bisect_left, bisect_right
+from itertools import islice
+
 from config import OPEN_METEO_API_BASE
 from utils.http_client import make_request
 
+# Seconds an identical Open-Meteo response is reused, matching the agent's tool caches
+FORECAST_CACHE_TTL = 1800
+HOURLY_CACHE_TTL = 900
+AIR_QUALITY_CACHE_TTL = 600
+UV_CACHE_TTL = 1800
+MARINE_CACHE_TTL = 1800
+
 
 def register_global_tools(mcp):
     """Register all global weather tools with the MCP server."""
 
     @mcp.tool()
-    async def get_global_forecast(latitude: float, longitude: float) -> str:
+    async def get_global_forecast(latitude: float, longitude: float, output_format: str = "text") -> str:
         """Get 7-day weather forecast for any location worldwide.
         Args:
             latitude: Latitude of the location
             longitude: Longitude of the location
+            output_format: "text" for readable lines, "json" for compact JSON rows
         """
         url = f"{OPEN_METEO_API_BASE}/forecast"
         params = {
@@ -20,31 +32,38 @@ def register_global_tools(mcp):
             "daily": "temperature_2m_max,temperature_2m_min,precipitation_sum,weathercode,windspeed_10m_max",
             "timezone": "auto",
         }
-        data = await make_request(url, params=params)
+        data = await make_request(url, params=params, cache_ttl=FORECAST_CACHE_TTL)
 
         if not data or "daily" not in data:
             return "Unable to fetch global forecast."
 
         daily = data["daily"]
-        forecasts = []
-        for i in range(len(daily["time"])):
-            weather_code = daily["weathercode"][i]
-            weather_desc = _weather_code_to_description(weather_code)
-            forecasts.append(
-                f"{daily['time'][i]}: {weather_desc}, "
-                f"High: {daily['temperature_2m_max'][i]}°C, "
-                f"Low: {daily['temperature_2m_min'][i]}°C, "
-                f"Precip: {daily['precipitation_sum'][i]}mm, "
-                f"Wind: {daily['windspeed_10m_max'][i]} km/h"
-            )
-        return "\n".join(forecasts)
+        rows = zip(
+            daily["time"],
+            daily["weathercode"],
+            daily["temperature_2m_max"],
+            daily["temperature_2m_min"],
+            daily["precipitation_sum"],
+            daily["windspeed_10m_max"],
+        )
+        if output_format == "json":
+            return _compact_json({"daily": [
+                {"date": time, "conditions": _weather_code_to_description(code), "hi": high, "lo": low, "precip": precip, "wind": wind}
+                for time, code, high, low, precip, wind in rows
+            ]})
+        return "\n".join(
+            f"{time}: {_weather_code_to_description(code)}, "
+            f"High: {high}°C, Low: {low}°C, Precip: {precip}mm, Wind: {wind} km/h"
+            for time, code, high, low, precip, wind in rows
+        )
 
     @mcp.tool()
-    async def get_global_hourly(latitude: float, longitude: float) -> str:
+    async def get_global_hourly(latitude: float, longitude: float, output_format: str = "text") -> str:
         """Get hourly weather forecast for any location worldwide (next 24 hours).
         Args:
             latitude: Latitude of the location
             longitude: Longitude of the location
+            output_format: "text" for readable lines, "json" for compact JSON rows
         """
         url = f"{OPEN_METEO_API_BASE}/forecast"
         params = {
@@ -54,23 +73,32 @@ def register_global_tools(mcp):
             "timezone": "auto",
             "forecast_hours": 24,
         }
-        data = await make_request(url, params=params)
+        data = await make_request(url, params=params, cache_ttl=HOURLY_CACHE_TTL)
 
         if not data or "hourly" not in data:
             return "Unable to fetch hourly forecast."
 
         hourly = data["hourly"]
-        forecasts = []
-        for i in range(min(24, len(hourly["time"]))):
-            weather_code = hourly["weathercode"][i]
-            weather_desc = _weather_code_to_description(weather_code)
-            forecasts.append(
-                f"{hourly['time'][i]}: {hourly['temperature_2m'][i]}°C, "
-                f"{weather_desc}, "
-                f"Precip: {hourly['precipitation'][i]}mm, "
-                f"Wind: {hourly['windspeed_10m'][i]} km/h"
-            )
-        return "\n".join(forecasts)
+        rows = islice(
+            zip(
+                hourly["time"],
+                hourly["temperature_2m"],
+                hourly["weathercode"],
+                hourly["precipitation"],
+                hourly["windspeed_10m"],
+            ),
+            24,
+        )
+        if output_format == "json":
+            return _compact_json({"hourly": [
+                {"time": time, "temp": temp, "conditions": _weather_code_to_description(code), "precip": precip, "wind": wind}
+                for time, temp, code, precip, wind in rows
+            ]})
+        return "\n".join(
+            f"{time}: {temp}°C, {_weather_code_to_description(code)}, "
+            f"Precip: {precip}mm, Wind: {wind} km/h"
+            for time, temp, code, precip, wind in rows
+        )
 
     @mcp.tool()
     async def get_air_quality(latitude: float, longitude: float) -> str:
@@ -85,7 +113,7 @@ def register_global_tools(mcp):
             "longitude": longitude,
             "current": "us_aqi,pm10,pm2_5,carbon_monoxide,nitrogen_dioxide,ozone",
         }
-        data = await make_request(url, params=params)
+        data = await make_request(url, params=params, cache_ttl=AIR_QUALITY_CACHE_TTL)
 
         if not data or "current" not in data:
             return "Unable to fetch air quality data."
@@ -114,12 +142,12 @@ Carbon Monoxide: {current.get('carbon_monoxide', 'N/A')} μg/m³
         params = {
             "latitude": latitude,
             "longitude": longitude,
-            "daily": "uv_index_max,uv_index_clear_sky_max",
+            "daily": "uv_index_max",
             "current": "uv_index",
             "timezone": "auto",
             "forecast_days": 3,
         }
-        data = await make_request(url, params=params)
+        data = await make_request(url, params=params, cache_ttl=UV_CACHE_TTL)
 
         if not data:
             return "Unable to fetch UV index data."
@@ -151,11 +179,11 @@ Carbon Monoxide: {current.get('carbon_monoxide', 'N/A')} μg/m³
         params = {
             "latitude": latitude,
             "longitude": longitude,
-            "daily": "wave_height_max,wave_direction_dominant,wave_period_max,wind_wave_height_max,swell_wave_height_max",
+            "daily": "wave_height_max,wave_direction_dominant,wave_period_max",
             "current": "wave_height,wave_direction,wave_period",
             "timezone": "auto",
         }
-        data = await make_request(url, params=params)
+        data = await make_request(url, params=params, cache_ttl=MARINE_CACHE_TTL)
 
         if not data:
             return "Unable to fetch marine forecast. Ensure location is near coast."
@@ -182,62 +210,72 @@ Carbon Monoxide: {current.get('carbon_monoxide', 'N/A')} μg/m³
         return "\n".join(result)
 
 
+# WMO weather interpretation codes, built once at import
+_WMO_CODES = {
+    0: "Clear sky",
+    1: "Mainly clear",
+    2: "Partly cloudy",
+    3: "Overcast",
+    45: "Foggy",
+    48: "Depositing rime fog",
+    51: "Light drizzle",
+    53: "Moderate drizzle",
+    55: "Dense drizzle",
+    61: "Slight rain",
+    63: "Moderate rain",
+    65: "Heavy rain",
+    71: "Slight snow",
+    73: "Moderate snow",
+    75: "Heavy snow",
+    77: "Snow grains",
+    80: "Slight rain showers",
+    81: "Moderate rain showers",
+    82: "Violent rain showers",
+    85: "Slight snow showers",
+    86: "Heavy snow showers",
+    95: "Thunderstorm",
+    96: "Thunderstorm with slight hail",
+    99: "Thunderstorm with heavy hail",
+}
+
+
+# WMO codes are small integers, so they index a dense table directly (None for unassigned)
+_WMO_TABLE = tuple(_WMO_CODES.get(code) for code in range(100))
+
+
 def _weather_code_to_description(code: int) -> str:
     """Convert WMO weather code to description."""
-    codes = {
-        0: "Clear sky",
-        1: "Mainly clear",
-        2: "Partly cloudy",
-        3: "Overcast",
-        45: "Foggy",
-        48: "Depositing rime fog",
-        51: "Light drizzle",
-        53: "Moderate drizzle",
-        55: "Dense drizzle",
-        61: "Slight rain",
-        63: "Moderate rain",
-        65: "Heavy rain",
-        71: "Slight snow",
-        73: "Moderate snow",
-        75: "Heavy snow",
-        77: "Snow grains",
-        80: "Slight rain showers",
-        81: "Moderate rain showers",
-        82: "Violent rain showers",
-        85: "Slight snow showers",
-        86: "Heavy snow showers",
-        95: "Thunderstorm",
-        96: "Thunderstorm with slight hail",
-        99: "Thunderstorm with heavy hail",
-    }
-    return codes.get(code, f"Unknown ({code})")
+    if type(code) is int and 0 <= code < 100:
+        description = _WMO_TABLE[code]
+    else:
+        description = _WMO_CODES.get(code)  # Floats such as 3.0 still match
+    return description or f"Unknown ({code})"
+
+
+# Upper bounds of each band; AQI bands are inclusive ("<= 50"), UV bands exclusive ("< 3")
+_AQI_THRESHOLDS = (50, 100, 150, 200, 300)
+_AQI_LEVELS = (
+    "Good",
+    "Moderate",
+    "Unhealthy for Sensitive Groups",
+    "Unhealthy",
+    "Very Unhealthy",
+    "Hazardous",
+)
+_UV_THRESHOLDS = (3, 6, 8, 11)
+_UV_LEVELS = ("Low", "Moderate", "High", "Very High", "Extreme")
 
 
 def _aqi_to_level(aqi: float) -> str:
     """Convert AQI to level description."""
-    if aqi <= 50:
-        return "Good"
-    elif aqi <= 100:
-        return "Moderate"
-    elif aqi <= 150:
-        return "Unhealthy for Sensitive Groups"
-    elif aqi <= 200:
-        return "Unhealthy"
-    elif aqi <= 300:
-        return "Very Unhealthy"
-    else:
-        return "Hazardous"
+    return _AQI_LEVELS[bisect_left(_AQI_THRESHOLDS, aqi)]
 
 
 def _uv_to_level(uv: float) -> str:
     """Convert UV index to level description."""
-    if uv < 3:
-        return "Low"
-    elif uv < 6:
-        return "Moderate"
-    elif uv < 8:
-        return "High"
-    elif uv < 11:
-        return "Very High"
-    else:
-        return "Extreme"
+    return _UV_LEVELS[bisect_right(_UV_THRESHOLDS, uv)]
+
+
+def _compact_json(payload: dict) -> str:
+    """Serialize a tool payload without whitespace, for token-lean LLM consumption."""
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
@@ -4,6 +4,9 @@ import json
 
 def register_intelligent_weather_tool(mcp):
     """Register the intelligent service tool with the MCP server."""
+    # Built on first use and shared by later calls; scoped to this server
+    # instance so a rebuilt app never reuses providers closed at shutdown
+    agent = None
 
     @mcp.tool()
     async def ask(
@@ -31,9 +34,12 @@ def register_intelligent_weather_tool(mcp):
         Returns:
             JSON string with structured response data
         """
-        from services.agent import ServiceAgent
+        nonlocal agent
+        if agent is None:
+            from services.agent import ServiceAgent
+
+            agent = ServiceAgent()
 
-        agent = ServiceAgent()
         result = await agent.process_request({
             "request": request,
             "context": context,
@@ -1,20 +1,94 @@
 """NWS (National Weather Service) tools - US only."""
+import asyncio
+from typing import Any
+
 from config import NWS_API_BASE
-from utils.http_client import make_nws_request
+from utils.http_client import make_nws_request, get_nws_points, peek_nws_points
+
+
+_ALERT_TEMPLATE = """
+Event: {event}
+Area: {areaDesc}
+Severity: {severity}
+Description: {description}
+Instructions: {instruction}
+"""
+
+_ALERT_DEFAULTS = {
+    "event": "Unknown",
+    "areaDesc": "Unknown",
+    "severity": "Unknown",
+    "description": "No description available",
+    "instruction": "No specific instructions provided",
+}
+
+
+class _AlertFields:
+    """Template mapping over alert properties with per-field defaults, without copying."""
+
+    __slots__ = ("props",)
+
+    def __init__(self, props: dict):
+        self.props = props
+
+    def __getitem__(self, key: str):
+        return self.props.get(key, _ALERT_DEFAULTS[key])
 
 
 def format_alert(feature: dict) -> str:
     """Format an alert feature into a readable string."""
-    props = feature["properties"]
-    return f"""
-Event: {props.get('event', 'Unknown')}
-Area: {props.get('areaDesc', 'Unknown')}
-Severity: {props.get('severity', 'Unknown')}
-Description: {props.get('description', 'No description available')}
-Instructions: {props.get('instruction', 'No specific instructions provided')}
+    return _ALERT_TEMPLATE.format_map(_AlertFields(feature["properties"]))
+
+
+# Fixed-query NWS endpoints
+_RADAR_STATIONS_URL = f"{NWS_API_BASE}/radar/stations"
+_HURRICANE_ALERTS_URL = f"{NWS_API_BASE}/alerts/active?event=Hurricane,Tropical%20Storm"
+
+_PERIOD_TEMPLATE = """
+{name}:
+Temperature: {temperature}°{temperatureUnit}
+Wind: {windSpeed} {windDirection}
+Forecast: {detailedForecast}
 """
 
 
+async def fetch_points_link(latitude: float, longitude: float, link: str) -> tuple[dict | None, Any]:
+    """Look up a location's /points and fetch one of its links (e.g. "forecast").
+
+    Returns (points, data); either is None if its request failed. When the
+    cached /points entry has expired, its stale link is fetched speculatively
+    alongside the refresh and kept if the refreshed link is unchanged.
+    """
+    cached, fresh = peek_nws_points(latitude, longitude)
+    if cached is None or fresh:
+        points = await get_nws_points(latitude, longitude)
+        data = await make_nws_request(points[link]) if points else None
+        return points, data
+
+    guess = cached[link]
+    points, data = await asyncio.gather(
+        get_nws_points(latitude, longitude),
+        make_nws_request(guess),
+    )
+    if points and points[link] != guess:
+        data = await make_nws_request(points[link])  # Grid reassigned; discard the guess
+    return points, data
+
+
+async def fetch_forecast(latitude: float, longitude: float) -> str:
+    """Fetch and format the 5-period NWS forecast for a US location."""
+    points, forecast_data = await fetch_points_link(latitude, longitude, "forecast")
+
+    if not points:
+        return "Unable to fetch forecast data for this location. Note: NWS only covers US locations."
+
+    if not forecast_data:
+        return "Unable to fetch detailed forecast."
+
+    periods = forecast_data["properties"]["periods"]
+    return "\n---\n".join(_PERIOD_TEMPLATE.format_map(period) for period in periods[:5])
+
+
 def register_nws_tools(mcp):
     """Register all NWS tools with the MCP server."""
 
@@ -31,8 +105,7 @@ def register_nws_tools(mcp):
         if not data["features"]:
             return "No active alerts for this state."
 
-        alerts = [format_alert(feature) for feature in data["features"]]
-        return "\n---\n".join(alerts)
+        return "\n---\n".join(map(format_alert, data["features"]))
 
     @mcp.tool()
     async def get_forecast(latitude: float, longitude: float) -> str:
@@ -41,29 +114,24 @@ def register_nws_tools(mcp):
             latitude: Latitude of the location
             longitude: Longitude of the location
         """
-        points_url = f"{NWS_API_BASE}/points/{latitude},{longitude}"
-        points_data = await make_nws_request(points_url)
-
-        if not points_data:
-            return "Unable to fetch forecast data for this location. Note: NWS only covers US locations."
+        return await fetch_forecast(latitude, longitude)
 
-        forecast_url = points_data["properties"]["forecast"]
-        forecast_data = await make_nws_request(forecast_url)
-
-        if not forecast_data:
-            return "Unable to fetch detailed forecast."
-
-        periods = forecast_data["properties"]["periods"]
-        forecasts = []
-        for period in periods[:5]:
-            forecast = f"""
-{period['name']}:
-Temperature: {period['temperature']}°{period['temperatureUnit']}
-Wind: {period['windSpeed']} {period['windDirection']}
-Forecast: {period['detailedForecast']}
-"""
-            forecasts.append(forecast)
-        return "\n---\n".join(forecasts)
+    @mcp.tool()
+    async def get_forecasts(points: list[tuple[float, float]]) -> str:
+        """Get weather forecasts for several US locations at once.
+        Args:
+            points: List of (latitude, longitude) pairs
+        """
+        results = await asyncio.gather(
+            *(fetch_forecast(latitude, longitude) for latitude, longitude in points),
+            return_exceptions=True,
+        )
+        sections = []
+        for (latitude, longitude), result in zip(points, results):
+            if isinstance(result, Exception):
+                result = f"Unable to fetch forecast: {result}"
+            sections.append(f"## Forecast for ({latitude}, {longitude})\n{result}")
+        return "\n\n".join(sections)
 
     @mcp.tool()
     async def get_hourly_forecast(latitude: float, longitude: float) -> str:
@@ -72,15 +140,11 @@ Forecast: {period['detailedForecast']}
             latitude: Latitude of the location
             longitude: Longitude of the location
         """
-        points_url = f"{NWS_API_BASE}/points/{latitude},{longitude}"
-        points_data = await make_nws_request(points_url)
+        points, hourly_data = await fetch_points_link(latitude, longitude, "forecastHourly")
 
-        if not points_data:
+        if not points:
             return "Unable to fetch forecast data. Note: NWS only covers US locations."
 
-        hourly_url = points_data["properties"]["forecastHourly"]
-        hourly_data = await make_nws_request(hourly_url)
-
         if not hourly_data:
             return "Unable to fetch hourly forecast."
 
@@ -98,15 +162,11 @@ Forecast: {period['detailedForecast']}
             latitude: Latitude of the location
             longitude: Longitude of the location
         """
-        points_url = f"{NWS_API_BASE}/points/{latitude},{longitude}"
-        points_data = await make_nws_request(points_url)
+        points, stations_data = await fetch_points_link(latitude, longitude, "observationStations")
 
-        if not points_data:
+        if not points:
             return "Unable to fetch location data. Note: NWS only covers US locations."
 
-        stations_url = points_data["properties"]["observationStations"]
-        stations_data = await make_nws_request(stations_url)
-
         if not stations_data or not stations_data.get("features"):
             return "No observation stations found nearby."
 
@@ -140,8 +200,7 @@ Wind: {round(wind_speed * 2.237, 1) if wind_speed else 'N/A'} mph from {wind_dir
             latitude: Latitude of the location
             longitude: Longitude of the location
         """
-        url = f"{NWS_API_BASE}/radar/stations"
-        data = await make_nws_request(url)
+        data = await make_nws_request(_RADAR_STATIONS_URL)
 
         if not data or "features" not in data:
             return "Unable to fetch radar stations."
@@ -158,8 +217,7 @@ Wind: {round(wind_speed * 2.237, 1) if wind_speed else 'N/A'} mph from {wind_dir
     @mcp.tool()
     async def get_active_hurricanes() -> str:
         """Get active tropical storms and hurricanes in the US."""
-        url = f"{NWS_API_BASE}/alerts/active?event=Hurricane,Tropical%20Storm"
-        data = await make_nws_request(url)
+        data = await make_nws_request(_HURRICANE_ALERTS_URL)
 
         if not data or "features" not in data:
             return "Unable to fetch hurricane alerts."
@@ -167,5 +225,4 @@ Wind: {round(wind_speed * 2.237, 1) if wind_speed else 'N/A'} mph from {wind_dir
         if not data["features"]:
             return "No active hurricane or tropical storm alerts."
 
-        alerts = [format_alert(feature) for feature in data["features"]]
-        return "\n---\n".join(alerts)
+        return "\n---\n".join(map(format_alert, data["features"]))
@@ -1,7 +1,59 @@
 """Utility tools - sunrise/sunset, weather comparison, summaries."""
+import asyncio
+from datetime import datetime, timezone
+
 from config import SUNRISE_SUNSET_API_BASE, OPEN_METEO_API_BASE
 from utils.http_client import make_request
 
+from .global_tools import AIR_QUALITY_CACHE_TTL, _aqi_to_level, _weather_code_to_description
+
+# Seconds an identical API response is reused
+CURRENT_CACHE_TTL = 300
+SUNRISE_CACHE_TTL = 86400  # Times for an explicit date never change
+SUNRISE_COORD_PRECISION = 3  # ~100 m, a fraction of a second of sunrise time
+
+# Fixed endpoints and query parameters; each call adds only its coordinates
+_FORECAST_URL = f"{OPEN_METEO_API_BASE}/forecast"
+_AIR_QUALITY_URL = "https://air-quality-api.open-meteo.com/v1/air-quality"
+_COMPARE_PARAMS = {
+    "current": "temperature_2m,relative_humidity_2m,precipitation,weathercode,windspeed_10m",
+    "timezone": "auto",
+}
+_SUMMARY_PARAMS = {
+    "current": "temperature_2m,relative_humidity_2m,weathercode,windspeed_10m,uv_index",
+    "daily": "temperature_2m_max,temperature_2m_min,weathercode",
+    "timezone": "auto",
+    "forecast_days": 3,
+}
+_SUMMARY_AQI_PARAMS = {"current": "us_aqi,pm2_5"}
+
+
+_COMPARE_TEMPLATE = """
+{label}:
+  Temperature: {temperature_2m}°C
+  Humidity: {relative_humidity_2m}%
+  Conditions: {conditions}
+  Wind: {windspeed_10m} km/h
+  Precipitation: {precipitation} mm
+"""
+
+
+class _CurrentFields:
+    """Template mapping over an Open-Meteo ``current`` block, defaulting missing fields to N/A."""
+
+    __slots__ = ("current", "label")
+
+    def __init__(self, current: dict, label: str):
+        self.current = current
+        self.label = label
+
+    def __getitem__(self, key: str):
+        if key == "label":
+            return self.label
+        if key == "conditions":
+            return _weather_code_to_description(self.current.get("weathercode", 0))
+        return self.current.get(key, "N/A")
+
 
 def register_utility_tools(mcp):
     """Register all utility tools with the MCP server."""
@@ -15,15 +67,17 @@ def register_utility_tools(mcp):
             date: Date in YYYY-MM-DD format or "today" (default: today)
         """
         url = f"{SUNRISE_SUNSET_API_BASE}/json"
+        if date == "today":
+            # Resolved here so the cache key names the day it answers for
+            date = datetime.now(timezone.utc).date().isoformat()
         params = {
-            "lat": latitude,
-            "lng": longitude,
+            "lat": round(latitude, SUNRISE_COORD_PRECISION),
+            "lng": round(longitude, SUNRISE_COORD_PRECISION),
             "formatted": 0,
+            "date": date,
         }
-        if date != "today":
-            params["date"] = date
 
-        data = await make_request(url, params=params)
+        data = await make_request(url, params=params, cache_ttl=SUNRISE_CACHE_TTL)
 
         if not data or data.get("status") != "OK":
             return "Unable to fetch sunrise/sunset data."
@@ -49,41 +103,23 @@ Civil Twilight End: {results['civil_twilight_end']}
             lat2: Latitude of second location
             lon2: Longitude of second location
         """
-        url = f"{OPEN_METEO_API_BASE}/forecast"
-
         async def get_weather(lat, lon):
-            params = {
-                "latitude": lat,
-                "longitude": lon,
-                "current": "temperature_2m,relative_humidity_2m,precipitation,weathercode,windspeed_10m",
-                "timezone": "auto",
-            }
-            return await make_request(url, params=params)
+            params = {**_COMPARE_PARAMS, "latitude": lat, "longitude": lon}
+            return await make_request(_FORECAST_URL, params=params, cache_ttl=CURRENT_CACHE_TTL)
 
-        data1 = await get_weather(lat1, lon1)
-        data2 = await get_weather(lat2, lon2)
+        # make_request returns None on failure, so neither fetch raises
+        data1, data2 = await asyncio.gather(get_weather(lat1, lon1), get_weather(lat2, lon2))
 
         if not data1 or not data2:
             return "Unable to fetch weather data for comparison."
 
-        def format_current(data, label):
-            current = data.get("current", {})
-            weather_code = current.get("weathercode", 0)
-            weather_desc = _weather_code_to_description(weather_code)
-            return f"""
-{label}:
-  Temperature: {current.get('temperature_2m', 'N/A')}°C
-  Humidity: {current.get('relative_humidity_2m', 'N/A')}%
-  Conditions: {weather_desc}
-  Wind: {current.get('windspeed_10m', 'N/A')} km/h
-  Precipitation: {current.get('precipitation', 'N/A')} mm
-"""
-
-        result1 = format_current(data1, f"Location 1 ({lat1}, {lon1})")
-        result2 = format_current(data2, f"Location 2 ({lat2}, {lon2})")
+        current1 = data1.get("current", {})
+        current2 = data2.get("current", {})
+        result1 = _COMPARE_TEMPLATE.format_map(_CurrentFields(current1, f"Location 1 ({lat1}, {lon1})"))
+        result2 = _COMPARE_TEMPLATE.format_map(_CurrentFields(current2, f"Location 2 ({lat2}, {lon2})"))
 
-        temp1 = data1.get("current", {}).get("temperature_2m")
-        temp2 = data2.get("current", {}).get("temperature_2m")
+        temp1 = current1.get("temperature_2m")
+        temp2 = current2.get("temperature_2m")
         temp_diff = ""
         if temp1 is not None and temp2 is not None:
             diff = temp1 - temp2
@@ -94,7 +130,7 @@ Civil Twilight End: {results['civil_twilight_end']}
             else:
                 temp_diff = "\n📊 Both locations have the same temperature"
 
-        return result1 + result2 + temp_diff
+        return "".join((result1, result2, temp_diff))
 
     @mcp.tool()
     async def get_weather_summary(latitude: float, longitude: float) -> str:
@@ -103,24 +139,13 @@ Civil Twilight End: {results['civil_twilight_end']}
             latitude: Latitude of the location
             longitude: Longitude of the location
         """
-        forecast_url = f"{OPEN_METEO_API_BASE}/forecast"
-        forecast_params = {
-            "latitude": latitude,
-            "longitude": longitude,
-            "current": "temperature_2m,relative_humidity_2m,precipitation,weathercode,windspeed_10m,uv_index",
-            "daily": "temperature_2m_max,temperature_2m_min,precipitation_sum,weathercode",
-            "timezone": "auto",
-            "forecast_days": 3,
-        }
-        forecast_data = await make_request(forecast_url, params=forecast_params)
+        location = {"latitude": latitude, "longitude": longitude}
 
-        aqi_url = "https://air-quality-api.open-meteo.com/v1/air-quality"
-        aqi_params = {
-            "latitude": latitude,
-            "longitude": longitude,
-            "current": "us_aqi,pm2_5",
-        }
-        aqi_data = await make_request(aqi_url, params=aqi_params)
+        # Independent hosts; make_request returns None on failure instead of raising
+        forecast_data, aqi_data = await asyncio.gather(
+            make_request(_FORECAST_URL, params={**_SUMMARY_PARAMS, **location}, cache_ttl=CURRENT_CACHE_TTL),
+            make_request(_AIR_QUALITY_URL, params={**_SUMMARY_AQI_PARAMS, **location}, cache_ttl=AIR_QUALITY_CACHE_TTL),
+        )
 
         if not forecast_data:
             return "Unable to fetch weather data."
@@ -149,60 +174,14 @@ Civil Twilight End: {results['civil_twilight_end']}
         if "daily" in forecast_data:
             daily = forecast_data["daily"]
             result.append("\n📅 3-DAY FORECAST:")
-            for i in range(len(daily["time"])):
-                weather_code = daily["weathercode"][i]
-                weather_desc = _weather_code_to_description(weather_code)
-                result.append(
-                    f"  {daily['time'][i]}: {weather_desc}, "
-                    f"High: {daily['temperature_2m_max'][i]}°C, "
-                    f"Low: {daily['temperature_2m_min'][i]}°C"
+            result.extend(
+                f"  {time}: {_weather_code_to_description(code)}, High: {high}°C, Low: {low}°C"
+                for time, code, high, low in zip(
+                    daily["time"],
+                    daily["weathercode"],
+                    daily["temperature_2m_max"],
+                    daily["temperature_2m_min"],
                 )
+            )
 
         return "\n".join(result)
-
-
-def _weather_code_to_description(code: int) -> str:
-    """Convert WMO weather code to description."""
-    codes = {
-        0: "Clear sky",
-        1: "Mainly clear",
-        2: "Partly cloudy",
-        3: "Overcast",
-        45: "Foggy",
-        48: "Depositing rime fog",
-        51: "Light drizzle",
-        53: "Moderate drizzle",
-        55: "Dense drizzle",
-        61: "Slight rain",
-        63: "Moderate rain",
-        65: "Heavy rain",
-        71: "Slight snow",
-        73: "Moderate snow",
-        75: "Heavy snow",
-        77: "Snow grains",
-        80: "Slight rain showers",
-        81: "Moderate rain showers",
-        82: "Violent rain showers",
-        85: "Slight snow showers",
-        86: "Heavy snow showers",
-        95: "Thunderstorm",
-        96: "Thunderstorm with slight hail",
-        99: "Thunderstorm with heavy hail",
-    }
-    return codes.get(code, f"Unknown ({code})")
-
-
-def _aqi_to_level(aqi: float) -> str:
-    """Convert AQI to level description."""
-    if aqi <= 50:
-        return "Good"
-    elif aqi <= 100:
-        return "Moderate"
-    elif aqi <= 150:
-        return "Unhealthy for Sensitive Groups"
-    elif aqi <= 200:
-        return "Unhealthy"
-    elif aqi <= 300:
-        return "Very Unhealthy"
-    else:
-        return "Hazardous"
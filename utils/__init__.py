@@ -1 +1 @@
-from .http_client import make_request, make_nws_request, make_nominatim_request
+from .http_client import make_request, make_nws_request, make_nominatim_request, get_nws_points, peek_nws_points
@@ -0,0 +1,13 @@
+"""Size-bounded insertion into the dict-backed caches used across the server."""
+from typing import Any, Hashable
+
+
+def put_bounded(cache: dict, key: Hashable, value: Any, max_entries: int) -> None:
+    """Store value under key, evicting the oldest insertion first if the cache is full.
+
+    Dicts keep insertion order, so the first key is the oldest entry; this
+    gives FIFO eviction without a separate ordering structure.
+    """
+    if key not in cache and len(cache) >= max_entries:
+        del cache[next(iter(cache))]
+    cache[key] = value
@@ -1,50 +1,256 @@
-from typing import Any
+import asyncio
+import logging
+import time
+from importlib.util import find_spec
+from typing import Any, Awaitable, Callable
 import httpx
+
+try:
+    import orjson as _json  # C-accelerated; much faster on large NWS GeoJSON payloads
+except ImportError:
+    import json as _json
+
 from config import (
     NWS_API_BASE,
     NOMINATIM_API_BASE,
     USER_AGENT,
     DEFAULT_TIMEOUT,
+    CONNECT_TIMEOUT,
 )
 
+from .bounded_cache import put_bounded
+
+logger = logging.getLogger(__name__)
+
+# Connection pool shared by every outbound API call (NWS, Open-Meteo, Nominatim, ...)
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64, keepalive_expiry=60.0)
+HTTP_TIMEOUT = httpx.Timeout(DEFAULT_TIMEOUT, connect=CONNECT_TIMEOUT)
+
+# Failed GETs are retried after RETRY_BACKOFF, then twice that, ...; only errors
+# where the request likely never reached the server, or 5xx responses, are retried
+# (a read timeout already spent the full DEFAULT_TIMEOUT)
+RETRY_ATTEMPTS = 2
+RETRY_BACKOFF = 0.1
+TRANSIENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout, httpx.RemoteProtocolError)
+
+# httpx only speaks HTTP/2 when the optional h2 package is installed
+HTTP2_AVAILABLE = find_spec("h2") is not None
+
+# A /points lookup (grid office + forecast URLs) is effectively permanent per location
+NWS_POINTS_TTL = 24 * 3600
+NWS_POINTS_PRECISION = 4  # Decimal places; NWS redirects more precise coordinates
+NWS_POINTS_MAX_ENTRIES = 1024
+
+# Sent with every NWS request; the User-Agent comes from the shared client
+NWS_HEADERS = {"Accept": "application/geo+json"}
+
+# Opt-in (cache_ttl) response cache for make_request, keyed by URL, params and headers
+RESPONSE_CACHE_MAX_ENTRIES = 1024
+
+# NWS responses kept for If-None-Match revalidation
+NWS_ETAG_MAX_ENTRIES = 256
+
+_client: httpx.AsyncClient | None = None
+_nws_points_cache: dict[tuple[float, float], tuple[float, dict[str, Any]]] = {}
+_response_cache: dict[tuple, tuple[float, Any]] = {}
+_inflight: dict[tuple, asyncio.Future] = {}
+_nws_etag_cache: dict[tuple[str, Callable | None], tuple[str, Any]] = {}
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared keep-alive HTTP client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            headers={"User-Agent": USER_AGENT},
+            timeout=HTTP_TIMEOUT,
+            follow_redirects=True,
+            http2=HTTP2_AVAILABLE,
+            limits=HTTP_LIMITS,
+        )
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared HTTP client (called on server shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
 
 async def make_request(
     url: str,
     headers: dict[str, str] | None = None,
     params: dict[str, Any] | None = None,
-    timeout: float = DEFAULT_TIMEOUT,
-) -> dict[str, Any] | None:
-    """Make an async HTTP GET request with error handling."""
-    default_headers = {"User-Agent": USER_AGENT}
-    if headers:
-        default_headers.update(headers)
-
-    async with httpx.AsyncClient(follow_redirects=True) as client:
+    timeout: float | None = None,
+    decode: Callable[[bytes], Any] | None = None,
+    cache_ttl: float | None = None,
+) -> Any:
+    """Make an async HTTP GET request with error handling.
+
+    The body is parsed as JSON unless ``decode`` is given, in which case it
+    receives the raw response bytes (e.g. a typed msgspec decoder). ``timeout``
+    overrides the shared client's HTTP_TIMEOUT for this request. With
+    ``cache_ttl``, a successful result is reused for that many seconds by
+    identical requests; failures (None) are never cached. Concurrent identical
+    requests always share one in-flight fetch.
+    """
+    key = (url, _cache_items(params), _cache_items(headers), decode)
+    if cache_ttl:
+        entry = _response_cache.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+
+    task = _inflight.get(key)
+    if task is None:
+        task = _inflight[key] = asyncio.ensure_future(_fetch(url, headers, params, timeout, decode))
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+
+    # Shielded so one cancelled caller doesn't cancel the others
+    data = await asyncio.shield(task)
+    if cache_ttl and data is not None:
+        put_bounded(_response_cache, key, (time.monotonic() + cache_ttl, data), RESPONSE_CACHE_MAX_ENTRIES)
+    return data
+
+
+async def _fetch(
+    url: str,
+    headers: dict[str, str] | None,
+    params: dict[str, Any] | None,
+    timeout: float | None,
+    decode: Callable[[bytes], Any] | None,
+) -> Any:
+    """Perform one GET for make_request, returning the decoded body or None on failure."""
+    response = await _get(url, headers=headers, params=params, timeout=timeout)
+    if response is None:
+        return None
+    return _decode_body(url, response, decode)
+
+
+async def _get(
+    url: str,
+    headers: dict[str, str] | None = None,
+    params: dict[str, Any] | None = None,
+    timeout: float | None = None,
+) -> httpx.Response | None:
+    """GET url on the shared client, retrying transient failures with exponential backoff.
+
+    Returns the response for any status below 400 (including 304), or None
+    after logging a 4xx, a non-transient httpx error, or the last failed retry.
+    """
+    for attempt in range(RETRY_ATTEMPTS + 1):
         try:
-            response = await client.get(
+            response = await get_client().get(
                 url,
-                headers=default_headers,
+                headers=headers,
                 params=params,
-                timeout=timeout,
+                timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
             )
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            print(f"Error fetching {url}: {e}")
+        except TRANSIENT_ERRORS as e:
+            error = e
+        except httpx.HTTPError as e:
+            logger.warning("Error fetching %s: %s", url, e)
+            return None
+        else:
+            if response.status_code < 400:
+                return response
+            if response.status_code < 500:
+                logger.warning("Error fetching %s: HTTP %s", url, response.status_code)
+                return None
+            error = f"HTTP {response.status_code}"
+
+        if attempt == RETRY_ATTEMPTS:
+            logger.warning("Error fetching %s after %d attempts: %s", url, attempt + 1, error)
             return None
+        await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+
+
+def _decode_body(url: str, response: httpx.Response, decode: Callable[[bytes], Any] | None) -> Any:
+    """Decode a response body, logging and returning None if it is malformed."""
+    try:
+        return (decode or _json.loads)(response.content)
+    except Exception as e:  # orjson, json and msgspec raise unrelated error types
+        logger.warning("Error decoding %s: %s", url, e)
+        return None
+
+
+def _cache_items(mapping: dict[str, Any] | None) -> tuple:
+    """Order-independent, hashable form of a params/headers dict for cache keys."""
+    return tuple(sorted(mapping.items())) if mapping else ()
+
+
+async def make_nws_request(url: str, decode: Callable[[bytes], Any] | None = None) -> Any:
+    """Make a request to the NWS API with proper headers.
 
+    Responses carrying an ETag are remembered per URL and revalidated with
+    If-None-Match, so an unchanged resource comes back as a bodyless 304 and
+    the previously decoded value is returned without parsing.
+    """
+    key = (url, decode)
+    entry = _nws_etag_cache.get(key)
+    headers = NWS_HEADERS if entry is None else {**NWS_HEADERS, "If-None-Match": entry[0]}
+    response = await _get(url, headers=headers)
+    if response is None:
+        return None
+    if response.status_code == 304 and entry is not None:
+        return entry[1]
+    data = _decode_body(url, response, decode)
+    if data is None:
+        return None
 
-async def make_nws_request(url: str) -> dict[str, Any] | None:
-    """Make a request to the NWS API with proper headers."""
-    headers = {"Accept": "application/geo+json"}
-    return await make_request(url, headers=headers)
+    etag = response.headers.get("ETag")
+    if etag:
+        put_bounded(_nws_etag_cache, key, (etag, data), NWS_ETAG_MAX_ENTRIES)
+    return data
 
 
-async def make_nominatim_request(
+def _nws_points_key(latitude: float, longitude: float) -> tuple[float, float]:
+    """Round a coordinate the way NWS /points does, so nearby lookups share an entry."""
+    return (round(latitude, NWS_POINTS_PRECISION), round(longitude, NWS_POINTS_PRECISION))
+
+
+def peek_nws_points(latitude: float, longitude: float) -> tuple[dict[str, Any] | None, bool]:
+    """Return the last cached /points properties for a location and whether they are fresh.
+
+    Expired entries are still returned: a grid assignment rarely changes, so
+    their URLs make a good guess to fetch while the lookup is refreshed.
+    """
+    entry = _nws_points_cache.get(_nws_points_key(latitude, longitude))
+    if entry is None:
+        return None, False
+    return entry[1], entry[0] > time.monotonic()
+
+
+async def get_nws_points(latitude: float, longitude: float) -> dict[str, Any] | None:
+    """Return the NWS /points properties for a location, cached per rounded coordinate.
+
+    Saves the first of the two dependent NWS requests (points, then
+    forecast/hourly/stations) on repeat lookups of the same location.
+    """
+    key = _nws_points_key(latitude, longitude)
+    entry = _nws_points_cache.get(key)
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+
+    data = await make_nws_request(f"{NWS_API_BASE}/points/{key[0]},{key[1]}")
+    if not data:
+        return None
+
+    properties = data["properties"]
+    put_bounded(_nws_points_cache, key, (time.monotonic() + NWS_POINTS_TTL, properties), NWS_POINTS_MAX_ENTRIES)
+    return properties
+
+
+def make_nominatim_request(
     endpoint: str,
     params: dict[str, Any],
-) -> dict[str, Any] | list[dict[str, Any]] | None:
-    """Make a request to the Nominatim API with proper headers."""
+) -> Awaitable[dict[str, Any] | list[dict[str, Any]] | None]:
+    """Make a request to the Nominatim API with proper headers.
+
+    A plain function returning make_request's coroutine, so awaiting it costs
+    no extra coroutine frame.
+    """
     url = f"{NOMINATIM_API_BASE}/{endpoint}"
     params["format"] = "json"
-    return await make_request(url, params=params)
+    return make_request(url, params=params)